@@ -453,9 +453,17 @@ private:
               start_time + (kFwd ? 1 : -1) *
                                (std::min(fastest_direct_, q_.max_travel_time_) +
                                 duration_t{1});
-          algo_.execute(start_time, q_.max_transfers_, worst_time_at_dest,
-                        q_.prf_idx_, state_.results_);
+          {
+            auto algo_span = get_otel_tracer()->StartSpan("search::algo");
+            auto algo_scope = opentelemetry::trace::Scope{algo_span};
+            algo_.execute(start_time, q_.max_transfers_, worst_time_at_dest,
+                          q_.prf_idx_, state_.results_);
+          }
 
+          auto reconstruct_span =
+              get_otel_tracer()->StartSpan("search::reconstruct");
+          auto reconstruct_scope =
+              opentelemetry::trace::Scope{reconstruct_span};
           for (auto& j : state_.results_) {
             if (j.legs_.empty() && !j.error_ &&
                 (is_ontrip() || search_interval_.contains(j.start_time_)) &&
@@ -254,6 +254,7 @@ struct timetable {
   void write(cista::memory_holder&) const;
   void write(std::filesystem::path const&) const;
   static cista::wrapped<timetable> read(std::filesystem::path const&);
+  static cista::wrapped<timetable> read(cista::memory_holder&&);
 
   bool has_car_transport(route_idx_t const r) const {
     return route_cars_allowed_[to_idx(r) * 2U] ||
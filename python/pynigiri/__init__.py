@@ -6,11 +6,14 @@ __version__ = "0.1.4"
 __all__ = [
     # Core types
     "Timetable",
+    "TimetableBuffer",
     "Location",
     "LocationIdx",
     
     # Loader
     "load_timetable",
+    "read_timetable",
+    "ShapesStorage",
     "TimetableSource",
     "LoaderConfig",
     "FinalizeOptions",
@@ -21,12 +24,27 @@ __all__ = [
     "Journey",
     "Leg",
     "Offset",
+    "get_fares",
+    "get_fare_product",
+    "get_leg_shapes",
     
     # Real-time
     "RtTimetable",
     "create_rt_timetable",
     "gtfsrt_update",
     "Statistics",
+    "VdvAusUpdater",
+    "VdvAusStatistics",
+    
+    # Metrics
+    "get_byte_sizes",
+    "get_rt_byte_sizes",
+    "get_metrics",
+    
+    # Tracing
+    "enable_tracing",
+    "flush_tracing",
+    "disable_tracing",
     
     # Enums
     "Direction",
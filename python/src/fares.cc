@@ -0,0 +1,217 @@
+#include "pybind_common.h"
+
+#include <pybind11/numpy.h>
+
+#include "nigiri/fares.h"
+#include "nigiri/routing/journey.h"
+#include "nigiri/rt/rt_timetable.h"
+#include "nigiri/timetable.h"
+
+#include "utl/parallel_for.h"
+
+#include <algorithm>
+#include <cstdint>
+#include <limits>
+#include <map>
+#include <vector>
+
+namespace py = pybind11;
+using namespace nigiri;
+using routing::journey;
+
+namespace {
+
+constexpr auto const kNoAmount = std::numeric_limits<float>::quiet_NaN();
+
+// One matched fare leg rule. Legs are ordinals into the transit legs.
+struct fare_row {
+  std::int32_t transfer_;
+  std::int32_t from_transit_leg_, to_transit_leg_;
+  std::int32_t src_;
+  std::int64_t product_, transfer_product_;
+  float amount_, transfer_amount_;
+};
+
+std::vector<journey::leg const*> transit_legs(journey const& j) {
+  auto legs = std::vector<journey::leg const*>{};
+  for (auto const& l : j.legs_) {
+    if (std::holds_alternative<journey::run_enter_exit>(l.uses_)) {
+      legs.push_back(&l);
+    }
+  }
+  return legs;
+}
+
+float get_amount(fares const& f, fare_product_idx_t const p) {
+  if (p == fare_product_idx_t::invalid() ||
+      to_idx(p) >= f.fare_products_.size() ||
+      f.fare_products_[p].empty()) {
+    return kNoAmount;
+  }
+  return f.fare_products_[p].front().amount_;
+}
+
+std::int64_t to_int(fare_product_idx_t const p) {
+  return p == fare_product_idx_t::invalid() ? -1 : to_idx(p);
+}
+
+std::vector<fare_row> price(timetable const& tt,
+                            rt_timetable const* rtt,
+                            journey const& j) {
+  auto const legs = transit_legs(j);
+  auto const ordinal = [&](journey::leg const* l) {
+    return static_cast<std::int32_t>(std::find(begin(legs), end(legs), l) -
+                                     begin(legs));
+  };
+
+  auto rows = std::vector<fare_row>{};
+  auto const transfers = get_fares(tt, rtt, j);
+  for (auto i = 0U; i != transfers.size(); ++i) {
+    auto const& t = transfers[i];
+    for (auto const& fl : t.legs_) {
+      auto const& f = tt.fares_[fl.src_];
+      auto const transfer_product = t.rule_.has_value()
+                                        ? t.rule_->fare_product_
+                                        : fare_product_idx_t::invalid();
+      auto row = fare_row{.transfer_ = static_cast<std::int32_t>(i),
+                          .from_transit_leg_ = ordinal(fl.joined_leg_.front()),
+                          .to_transit_leg_ = ordinal(fl.joined_leg_.back()),
+                          .src_ = static_cast<std::int32_t>(to_idx(fl.src_)),
+                          .product_ = -1,
+                          .transfer_product_ = to_int(transfer_product),
+                          .amount_ = kNoAmount,
+                          .transfer_amount_ = get_amount(f, transfer_product)};
+      if (fl.rule_.empty()) {
+        rows.push_back(row);
+      }
+      for (auto const& r : fl.rule_) {
+        row.product_ = to_int(r.fare_product_);
+        row.amount_ = get_amount(f, r.fare_product_);
+        rows.push_back(row);
+      }
+    }
+  }
+  return rows;
+}
+
+template <typename T>
+py::array_t<T> to_array(std::vector<T> const& v) {
+  auto arr = py::array_t<T>(static_cast<py::ssize_t>(v.size()));
+  std::copy(begin(v), end(v), arr.mutable_data());
+  return arr;
+}
+
+}  // namespace
+
+void init_fares(py::module_& m) {
+  // Batched fare computation
+  m.def(
+      "get_fares",
+      [](timetable const& tt, std::vector<journey> const& journeys,
+         rt_timetable const* rtt, bool const parallel) {
+        // Journeys that only differ in footpaths/offsets share their fares:
+        // price each distinct sequence of transit legs once.
+        auto unique = std::map<std::vector<journey::leg>, std::size_t>{};
+        auto representative = std::vector<std::size_t>{};
+        auto journey_unique = std::vector<std::size_t>(journeys.size());
+        for (auto i = 0U; i != journeys.size(); ++i) {
+          auto key = std::vector<journey::leg>{};
+          for (auto const* l : transit_legs(journeys[i])) {
+            key.push_back(*l);
+          }
+          auto const [it, inserted] =
+              unique.emplace(std::move(key), representative.size());
+          if (inserted) {
+            representative.push_back(i);
+          }
+          journey_unique[i] = it->second;
+        }
+
+        auto rows = std::vector<std::vector<fare_row>>(representative.size());
+        {
+          py::gil_scoped_release release;
+          auto const compute = [&](std::size_t const u) {
+            rows[u] = price(tt, rtt, journeys[representative[u]]);
+          };
+          if (parallel) {
+            utl::parallel_for_run(representative.size(), compute);
+          } else {
+            for (auto u = 0U; u != representative.size(); ++u) {
+              compute(u);
+            }
+          }
+        }
+
+        auto journey_col = std::vector<std::int32_t>{};
+        auto transfer = std::vector<std::int32_t>{};
+        auto from_leg = std::vector<std::int32_t>{};
+        auto to_leg = std::vector<std::int32_t>{};
+        auto src = std::vector<std::int32_t>{};
+        auto product = std::vector<std::int64_t>{};
+        auto transfer_product = std::vector<std::int64_t>{};
+        auto amount = std::vector<float>{};
+        auto transfer_amount = std::vector<float>{};
+        for (auto i = 0U; i != journeys.size(); ++i) {
+          auto const& j = journeys[i];
+          auto const legs = transit_legs(j);
+          auto const leg_idx = [&](std::int32_t const ordinal) {
+            return static_cast<std::int32_t>(
+                legs[static_cast<std::size_t>(ordinal)] - j.legs_.data());
+          };
+          for (auto const& r : rows[journey_unique[i]]) {
+            journey_col.push_back(static_cast<std::int32_t>(i));
+            transfer.push_back(r.transfer_);
+            from_leg.push_back(leg_idx(r.from_transit_leg_));
+            to_leg.push_back(leg_idx(r.to_transit_leg_));
+            src.push_back(r.src_);
+            product.push_back(r.product_);
+            transfer_product.push_back(r.transfer_product_);
+            amount.push_back(r.amount_);
+            transfer_amount.push_back(r.transfer_amount_);
+          }
+        }
+
+        auto result = py::dict{};
+        result["journey"] = to_array(journey_col);
+        result["transfer"] = to_array(transfer);
+        result["from_leg"] = to_array(from_leg);
+        result["to_leg"] = to_array(to_leg);
+        result["source"] = to_array(src);
+        result["product"] = to_array(product);
+        result["transfer_product"] = to_array(transfer_product);
+        result["amount"] = to_array(amount);
+        result["transfer_amount"] = to_array(transfer_amount);
+        return result;
+      },
+      py::arg("timetable"),
+      py::arg("journeys"),
+      py::arg("rt_timetable") = nullptr,
+      py::arg("parallel") = false,
+      "Compute GTFS Fares v2 fares for a list of journeys. Returns a dict of "
+      "NumPy arrays with one row per matched fare leg rule.");
+
+  // Fare product lookup
+  m.def(
+      "get_fare_product",
+      [](timetable const& tt, source_idx_t const src, std::int64_t const p) {
+        auto const& f = tt.fares_.at(src);
+        auto const product = fare_product_idx_t{static_cast<std::uint32_t>(p)};
+        if (p < 0 || to_idx(product) >= f.fare_products_.size()) {
+          throw py::index_error();
+        }
+        auto result = py::list{};
+        for (auto const& fp : f.fare_products_[product]) {
+          auto d = py::dict{};
+          d["id"] = std::string{tt.strings_.get(f.fare_product_id_[product])};
+          d["name"] = std::string{tt.strings_.get(fp.name_)};
+          d["amount"] = fp.amount_;
+          d["currency"] = std::string{tt.strings_.get(fp.currency_code_)};
+          result.append(std::move(d));
+        }
+        return result;
+      },
+      py::arg("timetable"),
+      py::arg("source"),
+      py::arg("product"),
+      "Get all variants (name, amount, currency) of a fare product");
+}
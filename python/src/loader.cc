@@ -3,12 +3,15 @@
 #include "nigiri/loader/load.h"
 #include "nigiri/loader/loader_interface.h"
 #include "nigiri/loader/build_footpaths.h"
+#include "nigiri/shapes_storage.h"
 #include "nigiri/timetable.h"
 
 #include "date/date.h"
 #include "utl/progress_tracker.h"
 
 #include <chrono>
+#include <filesystem>
+#include <memory>
 #include <string>
 #include <vector>
 
@@ -16,6 +19,17 @@ namespace py = pybind11;
 using namespace nigiri;
 using namespace nigiri::loader;
 
+namespace {
+
+void check_writable(shapes_storage const* shapes) {
+  if (shapes != nullptr && shapes->mode_ != cista::mmap::protection::WRITE) {
+    throw py::value_error(
+        "shapes: ShapesStorage has to be opened with read_only=False");
+  }
+}
+
+}  // namespace
+
 void init_loader(py::module_& m) {
   // Loader config
   py::class_<loader_config>(m, "LoaderConfig")
@@ -57,7 +71,8 @@ void init_loader(py::module_& m) {
         [](std::vector<timetable_source> const& sources,
            std::string const& start_date,
            std::string const& end_date,
-           finalize_options const& options) -> timetable {
+           finalize_options const& options,
+           shapes_storage* shapes) -> timetable {
           // Activate progress tracker
           auto tracker = utl::activate_progress_tracker("pynigiri");
           
@@ -69,12 +84,14 @@ void init_loader(py::module_& m) {
           end_ss >> date::parse("%Y-%m-%d", end);
           
           auto const interval = ::nigiri::interval<date::sys_days>{start, end};
-          return load(sources, options, interval);
+          check_writable(shapes);
+          return load(sources, options, interval, nullptr, shapes);
         },
         py::arg("sources"),
         py::arg("start_date"),
         py::arg("end_date"),
         py::arg("options") = finalize_options{},
+        py::arg("shapes") = nullptr,
         "Load timetable from sources");
 
   // Convenience overload with datetime objects
@@ -82,18 +99,33 @@ void init_loader(py::module_& m) {
         [](std::vector<timetable_source> const& sources,
            std::chrono::system_clock::time_point const& start,
            std::chrono::system_clock::time_point const& end,
-           finalize_options const& options) -> timetable {
+           finalize_options const& options,
+           shapes_storage* shapes) -> timetable {
           // Activate progress tracker
           auto tracker = utl::activate_progress_tracker("pynigiri");
           
           auto const start_days = date::floor<date::days>(start);
           auto const end_days = date::floor<date::days>(end);
           auto const interval = ::nigiri::interval<date::sys_days>{start_days, end_days};
-          return load(sources, options, interval);
+          check_writable(shapes);
+          return load(sources, options, interval, nullptr, shapes);
         },
         py::arg("sources"),
         py::arg("start"),
         py::arg("end"),
         py::arg("options") = finalize_options{},
+        py::arg("shapes") = nullptr,
         "Load timetable from sources using datetime objects");
+
+  // Read binary timetable image written by Timetable.write
+  m.def("read_timetable",
+        [](std::string const& path) -> std::shared_ptr<timetable> {
+          // Keep the backing memory alive as long as the timetable is used.
+          auto const wrapped = std::make_shared<cista::wrapped<timetable>>(
+              timetable::read(std::filesystem::path{path}));
+          return std::shared_ptr<timetable>{wrapped, &**wrapped};
+        },
+        py::arg("path"),
+        "Read timetable from binary image. Read it once in the parent "
+        "process before forking workers to share it copy-on-write.");
 }
@@ -10,7 +10,11 @@ PYBIND11_MODULE(pynigiri, m) {
   // Initialize submodules
   init_types(m);
   init_timetable(m);
+  init_shapes(m);
   init_loader(m);
   init_routing(m);
   init_rt(m);
+  init_fares(m);
+  init_metrics(m);
+  init_tracing(m);
 }
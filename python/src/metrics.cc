@@ -0,0 +1,181 @@
+#include "pybind_common.h"
+
+#include "nigiri/rt/rt_timetable.h"
+#include "nigiri/timetable.h"
+#include "nigiri/timetable_metrics.h"
+
+#include "cista/reflection/for_each_field.h"
+
+#include <cstddef>
+#include <iterator>
+#include <string>
+#include <type_traits>
+
+namespace py = pybind11;
+using namespace nigiri;
+
+namespace {
+
+template <typename T>
+std::size_t heap_size(T const&);
+
+template <typename Range>
+std::size_t elements_heap_size(Range const& r) {
+  using value_t = std::decay_t<decltype(*std::begin(r))>;
+  if constexpr (std::is_trivially_copyable_v<value_t>) {
+    return 0U;
+  } else {
+    auto size = std::size_t{0U};
+    for (auto const& el : r) {
+      size += heap_size(el);
+    }
+    return size;
+  }
+}
+
+// Memory owned by x outside of sizeof(x), read from the container sizes
+// without copying anything.
+template <typename T>
+std::size_t heap_size(T const& x) {
+  if constexpr (std::is_trivially_copyable_v<T>) {
+    return 0U;
+  } else if constexpr (requires { x.is_short(); }) {  // string
+    return x.is_short() ? 0U : x.size();
+  } else if constexpr (requires {
+                         x.data_;
+                         x.bucket_starts_;
+                       }) {  // vecvec
+    return heap_size(x.data_) + heap_size(x.bucket_starts_);
+  } else if constexpr (requires {
+                         x.paged_;
+                         x.idx_;
+                       }) {  // paged_vecvec
+    return heap_size(x.paged_.data_) + heap_size(x.idx_);
+  } else if constexpr (requires { x.blocks_; }) {  // bitvec
+    return heap_size(x.blocks_);
+  } else if constexpr (requires {
+                         x.index_;
+                         x.data_;
+                       }) {  // nvec, dynamic_fws_multimap
+    return heap_size(x.index_) + heap_size(x.data_);
+  } else if constexpr (requires {
+                         x.ctrl_;
+                         x.capacity_;
+                       }) {  // hash_map, hash_set: one control byte per slot
+    using value_t = typename T::value_type;
+    return x.capacity_ * (sizeof(value_t) + 1U) + elements_heap_size(x);
+  } else if constexpr (requires { x.allocated_size_; }) {  // vector
+    using value_t = std::decay_t<decltype(*std::begin(x))>;
+    return x.allocated_size_ * sizeof(value_t) + elements_heap_size(x);
+  } else if constexpr (requires { std::begin(x); }) {  // array
+    return elements_heap_size(x);
+  } else if constexpr (std::is_aggregate_v<T>) {
+    auto size = std::size_t{0U};
+    cista::for_each_field(x, [&](auto const& f) { size += heap_size(f); });
+    return size;
+  } else {
+    return 0U;
+  }
+}
+
+// Memory of all given members including unused container capacity.
+template <typename... Ts>
+std::size_t byte_size(Ts const&... members) {
+  return ((sizeof(Ts) + heap_size(members)) + ...);
+}
+
+py::dict timetable_byte_sizes(timetable const& tt) {
+  auto const& l = tt.locations_;
+  auto sizes = py::dict{};
+  sizes["location_ids"] = byte_size(l.location_id_to_idx_, l.ids_);
+  sizes["locations"] =
+      byte_size(l.names_, l.platform_codes_, l.descriptions_, l.coordinates_,
+                l.src_, l.transfer_time_, l.types_, l.parents_,
+                l.location_timezones_, l.location_importance_,
+                l.equivalences_, l.children_, l.rtree_);
+  sizes["footpaths"] =
+      byte_size(l.footpaths_out_, l.footpaths_in_,
+                l.preprocessing_footpaths_out_, l.preprocessing_footpaths_in_);
+  sizes["bitfields"] = byte_size(tt.bitfields_);
+  sizes["route_stop_times"] =
+      byte_size(tt.route_stop_times_, tt.route_stop_time_ranges_);
+  sizes["route_location_seq"] =
+      byte_size(tt.route_location_seq_, tt.location_routes_);
+  sizes["transports"] = byte_size(
+      tt.transport_traffic_days_, tt.transport_route_,
+      tt.transport_first_dep_offset_, tt.initial_day_offset_,
+      tt.transport_to_trip_section_, tt.merged_trips_,
+      tt.transport_section_attributes_, tt.transport_section_providers_,
+      tt.transport_section_directions_);
+  sizes["trip_ids"] = byte_size(tt.trip_id_to_idx_, tt.trip_ids_,
+                                tt.trip_id_strings_, tt.trip_id_src_);
+  sizes["trips"] =
+      byte_size(tt.trip_transport_ranges_, tt.trip_stop_seq_numbers_,
+                tt.trip_debug_, tt.trip_short_names_, tt.trip_display_names_);
+  sizes["route_ids"] = byte_size(tt.route_ids_);
+  sizes["lb_graph"] =
+      byte_size(tt.fwd_search_lb_graph_, tt.bwd_search_lb_graph_);
+  sizes["fares"] = byte_size(tt.fares_, tt.areas_, tt.location_areas_);
+  sizes["strings"] = byte_size(tt.strings_, tt.translations_,
+                               tt.translation_language_, tt.languages_);
+  return sizes;
+}
+
+py::dict rt_timetable_byte_sizes(rt_timetable const& rtt) {
+  auto sizes = py::dict{};
+  sizes["rt_transports"] = byte_size(
+      rtt.static_trip_lookup_, rtt.rt_transport_static_transport_,
+      rtt.additional_trips_, rtt.rt_transport_src_,
+      rtt.rt_transport_direction_id_, rtt.rt_transport_route_id_,
+      rtt.rt_transport_direction_strings_,
+      rtt.rt_transport_section_directions_, rtt.rt_transport_stop_times_,
+      rtt.rt_transport_location_seq_, rtt.rt_transport_trip_short_names_,
+      rtt.rt_transport_line_, rtt.rt_transport_section_clasz_,
+      rtt.rt_transport_is_cancelled_, rtt.rt_transport_bikes_allowed_,
+      rtt.rt_transport_cars_allowed_, rtt.rt_bikes_allowed_per_section_,
+      rtt.rt_cars_allowed_per_section_);
+  sizes["location_rt_transports"] = byte_size(rtt.location_rt_transports_);
+  sizes["bitfields"] = byte_size(rtt.transport_traffic_days_, rtt.bitfields_);
+  sizes["td_footpaths"] =
+      byte_size(rtt.has_td_footpaths_out_, rtt.has_td_footpaths_in_,
+                rtt.td_footpaths_out_, rtt.td_footpaths_in_);
+  sizes["lb_graph"] = byte_size(
+      rtt.fwd_search_lb_graph_has_edges_, rtt.bwd_search_lb_graph_has_edges_,
+      rtt.fwd_search_lb_graph_, rtt.bwd_search_lb_graph_);
+  sizes["alerts"] = byte_size(rtt.alerts_);
+  return sizes;
+}
+
+}  // namespace
+
+void init_metrics(py::module_& m) {
+  m.def("get_byte_sizes",
+        &timetable_byte_sizes,
+        py::arg("timetable"),
+        "Get memory footprint in bytes of each timetable component as dict");
+
+  m.def("get_rt_byte_sizes",
+        &rt_timetable_byte_sizes,
+        py::arg("rt_timetable"),
+        "Get memory footprint in bytes of each real-time timetable "
+        "component as dict");
+
+  m.def("get_metrics",
+        [](timetable const& tt) {
+          auto const metrics = get_metrics(tt);
+          auto feeds = py::list{};
+          for (auto const& f : metrics.feeds_) {
+            auto d = py::dict{};
+            d["locations"] = f.locations_;
+            d["trips"] = f.trips_;
+            d["transport_days"] = f.transport_days_;
+            d["first_day"] = f.first_;
+            d["last_day"] = f.last_;
+            feeds.append(std::move(d));
+          }
+          return feeds;
+        },
+        py::arg("timetable"),
+        "Get per-feed metrics (locations, trips, transport days and first/"
+        "last day index) as list of dicts indexed by source");
+}
@@ -9,9 +9,28 @@
 
 namespace py = pybind11;
 
+// Buffer of a bytes-like object. Raises BufferError unless it is C-contiguous,
+// i.e. readable as size * itemsize bytes starting at ptr.
+inline py::buffer_info request_contiguous(py::buffer const& b) {
+  auto info = b.request();
+  auto expected = info.itemsize;
+  for (auto i = info.ndim; i != 0; --i) {
+    auto const dim = static_cast<std::size_t>(i - 1);
+    if (info.shape[dim] > 1 && info.strides[dim] != expected) {
+      throw py::buffer_error("buffer must be C-contiguous");
+    }
+    expected *= info.shape[dim];
+  }
+  return info;
+}
+
 // Forward declarations
 void init_types(py::module_&);
 void init_timetable(py::module_&);
+void init_shapes(py::module_&);
 void init_loader(py::module_&);
 void init_routing(py::module_&);
 void init_rt(py::module_&);
+void init_fares(py::module_&);
+void init_metrics(py::module_&);
+void init_tracing(py::module_&);
@@ -1,5 +1,7 @@
 #include "pybind_common.h"
 
+#include <pybind11/numpy.h>
+
 #include "nigiri/routing/query.h"
 #include "nigiri/routing/journey.h"
 #include "nigiri/routing/raptor_search.h"
@@ -9,7 +11,9 @@
 #include "nigiri/timetable.h"
 
 #include <chrono>
+#include <cstdint>
 #include <optional>
+#include <string>
 #include <variant>
 #include <vector>
 
@@ -17,6 +21,104 @@ namespace py = pybind11;
 using namespace nigiri;
 using namespace nigiri::routing;
 
+namespace {
+
+template <typename T>
+using array_t = py::array_t<T, py::array::c_style | py::array::forcecast>;
+
+void check_size(py::ssize_t const expected,
+                py::ssize_t const actual,
+                char const* name) {
+  if (actual != expected) {
+    throw py::value_error(std::string{name} + ": expected " +
+                          std::to_string(expected) + " elements, got " +
+                          std::to_string(actual));
+  }
+}
+
+void check_durations(array_t<std::int32_t> const& durations) {
+  auto const d = durations.data();
+  for (auto i = py::ssize_t{0}; i != durations.size(); ++i) {
+    if (d[i] < 0 || d[i] > duration_t::max().count()) {
+      throw py::value_error("durations: " + std::to_string(d[i]) +
+                            " at index " + std::to_string(i) +
+                            " out of range [0, " +
+                            std::to_string(duration_t::max().count()) + "]");
+    }
+  }
+}
+
+std::vector<offset> to_offsets(
+    array_t<std::uint32_t> const& targets,
+    array_t<std::int32_t> const& durations,
+    std::optional<array_t<std::uint32_t>> const& modes) {
+  auto const n = targets.size();
+  check_size(n, durations.size(), "durations");
+  if (modes.has_value()) {
+    check_size(n, modes->size(), "transport_modes");
+  }
+  check_durations(durations);
+
+  auto const t = targets.data();
+  auto const d = durations.data();
+  auto const mode = modes.has_value() ? modes->data() : nullptr;
+  auto offsets = std::vector<offset>{};
+  offsets.reserve(static_cast<std::size_t>(n));
+  for (auto i = py::ssize_t{0}; i != n; ++i) {
+    offsets.emplace_back(location_idx_t{t[i]}, duration_t{d[i]},
+                         mode == nullptr ? transport_mode_id_t{0} : mode[i]);
+  }
+  return offsets;
+}
+
+// CSR layout: offsets of locations[i] are [indptr[i], indptr[i + 1]).
+td_offsets_t to_td_offsets(
+    array_t<std::uint32_t> const& locations,
+    array_t<std::int64_t> const& indptr,
+    array_t<std::int32_t> const& valid_from,
+    array_t<std::int32_t> const& durations,
+    std::optional<array_t<std::uint32_t>> const& modes) {
+  auto const n = locations.size();
+  auto const m = valid_from.size();
+  check_size(n + 1, indptr.size(), "indptr");
+  check_size(m, durations.size(), "durations");
+  if (modes.has_value()) {
+    check_size(m, modes->size(), "transport_modes");
+  }
+  check_durations(durations);
+
+  auto const l = locations.data();
+  auto const ptr = indptr.data();
+  auto const from = valid_from.data();
+  auto const d = durations.data();
+  auto const mode = modes.has_value() ? modes->data() : nullptr;
+  if (ptr[0] != 0 || ptr[n] != m) {
+    throw py::value_error("indptr: must start at 0 and end at len(durations)");
+  }
+  // Validate all rows before reading any of them.
+  for (auto i = py::ssize_t{0}; i != n; ++i) {
+    if (ptr[i] > ptr[i + 1] || ptr[i + 1] > m) {
+      throw py::value_error(
+          "indptr: must be non-decreasing within [0, len(durations)]");
+    }
+  }
+
+  auto offsets = td_offsets_t{};
+  for (auto i = py::ssize_t{0}; i != n; ++i) {
+    auto& location_offsets = offsets[location_idx_t{l[i]}];
+    for (auto j = ptr[i]; j != ptr[i + 1]; ++j) {
+      location_offsets.push_back(
+          td_offset{.valid_from_ = unixtime_t{i32_minutes{from[j]}},
+                    .duration_ = duration_t{d[j]},
+                    .transport_mode_id_ =
+                        mode == nullptr ? transport_mode_id_t{0} : mode[j]});
+    }
+  }
+  return offsets;
+}
+
+}  // namespace
+
 void init_routing(py::module_& m) {
   // Transport mode ID - just return the int directly
   m.def("TransportModeId", [](std::uint32_t id) { return id; },
@@ -141,6 +243,62 @@ void init_routing(py::module_& m) {
       .def_readwrite("via_stops", &query::via_stops_)
       .def_readwrite("slow_direct", &query::slow_direct_)
       
+      // Vectorized offsets (NumPy arrays)
+      .def("set_start_offsets",
+           [](query& q, array_t<std::uint32_t> const& targets,
+              array_t<std::int32_t> const& durations,
+              std::optional<array_t<std::uint32_t>> const& modes) {
+             q.start_ = to_offsets(targets, durations, modes);
+           },
+           py::arg("targets"),
+           py::arg("durations"),
+           py::arg("transport_modes") = py::none(),
+           "Set start offsets from arrays of location indices, durations "
+           "(minutes) and transport mode ids")
+      .def("set_destination_offsets",
+           [](query& q, array_t<std::uint32_t> const& targets,
+              array_t<std::int32_t> const& durations,
+              std::optional<array_t<std::uint32_t>> const& modes) {
+             q.destination_ = to_offsets(targets, durations, modes);
+           },
+           py::arg("targets"),
+           py::arg("durations"),
+           py::arg("transport_modes") = py::none(),
+           "Set destination offsets from arrays of location indices, "
+           "durations (minutes) and transport mode ids")
+      .def("set_td_start_offsets",
+           [](query& q, array_t<std::uint32_t> const& locations,
+              array_t<std::int64_t> const& indptr,
+              array_t<std::int32_t> const& valid_from,
+              array_t<std::int32_t> const& durations,
+              std::optional<array_t<std::uint32_t>> const& modes) {
+             q.td_start_ =
+                 to_td_offsets(locations, indptr, valid_from, durations, modes);
+           },
+           py::arg("locations"),
+           py::arg("indptr"),
+           py::arg("valid_from"),
+           py::arg("durations"),
+           py::arg("transport_modes") = py::none(),
+           "Set time-dependent start offsets from CSR arrays: the offsets "
+           "of locations[i] are [indptr[i], indptr[i + 1])")
+      .def("set_td_destination_offsets",
+           [](query& q, array_t<std::uint32_t> const& locations,
+              array_t<std::int64_t> const& indptr,
+              array_t<std::int32_t> const& valid_from,
+              array_t<std::int32_t> const& durations,
+              std::optional<array_t<std::uint32_t>> const& modes) {
+             q.td_dest_ =
+                 to_td_offsets(locations, indptr, valid_from, durations, modes);
+           },
+           py::arg("locations"),
+           py::arg("indptr"),
+           py::arg("valid_from"),
+           py::arg("durations"),
+           py::arg("transport_modes") = py::none(),
+           "Set time-dependent destination offsets from CSR arrays: the "
+           "offsets of locations[i] are [indptr[i], indptr[i + 1])")
+      
       .def("flip_dir", &query::flip_dir, "Flip query direction")
       .def(py::self == py::self)
       
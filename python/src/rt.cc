@@ -2,17 +2,34 @@
 
 #include "nigiri/rt/create_rt_timetable.h"
 #include "nigiri/rt/gtfsrt_update.h"
+#include "nigiri/rt/json_to_xml.h"
 #include "nigiri/rt/rt_timetable.h"
 #include "nigiri/rt/frun.h"
+#include "nigiri/rt/vdv_aus.h"
 #include "nigiri/timetable.h"
 
+#include "pugixml.hpp"
+
+#include <exception>
 #include <string>
+#include <string_view>
 #include <vector>
 
 namespace py = pybind11;
 using namespace nigiri;
 using namespace nigiri::rt;
 
+namespace {
+
+// View into a contiguous bytes-like object (see request_contiguous). Valid
+// while the buffer_info is alive.
+std::string_view to_view(py::buffer_info const& info) {
+  return {static_cast<char const*>(info.ptr),
+          static_cast<std::size_t>(info.size * info.itemsize)};
+}
+
+}  // namespace
+
 void init_rt(py::module_& m) {
   // Statistics
   py::class_<statistics>(m, "Statistics")
@@ -66,22 +83,24 @@ void init_rt(py::module_& m) {
         py::arg("data"),
         "Update real-time timetable from GTFS-RT protobuf string");
 
-  // GTFS-RT update from bytes
+  // GTFS-RT update from bytes (any bytes-like object, no copy)
   m.def("gtfsrt_update_from_bytes",
         [](timetable const& tt,
            rt_timetable& rtt,
            source_idx_t src,
            std::string const& tag,
-           py::bytes const& data) -> statistics {
-          std::string str = data;
-          return gtfsrt_update_buf(tt, rtt, src, tag, str);
+           py::buffer const& data) -> statistics {
+          // Keep the GIL: it serializes all access to the rt_timetable.
+          auto const info = request_contiguous(data);
+          return gtfsrt_update_buf(tt, rtt, src, tag, to_view(info));
         },
         py::arg("timetable"),
         py::arg("rt_timetable"),
         py::arg("source"),
         py::arg("tag"),
         py::arg("data"),
-        "Update real-time timetable from GTFS-RT protobuf bytes");
+        "Update real-time timetable from GTFS-RT protobuf bytes, "
+        "bytearray or memoryview");
 
   // GTFS-RT update from file
   m.def("gtfsrt_update_from_file",
@@ -105,4 +124,87 @@ void init_rt(py::module_& m) {
         py::arg("tag"),
         py::arg("file_path"),
         "Update real-time timetable from GTFS-RT protobuf file");
+
+  // VDV AUS / SIRI statistics
+  py::class_<vdv_aus::statistics>(m, "VdvAusStatistics")
+      .def(py::init<>())
+      .def_readwrite("unsupported_additional_runs",
+                     &vdv_aus::statistics::unsupported_additional_runs_)
+      .def_readwrite("unsupported_additional_stops",
+                     &vdv_aus::statistics::unsupported_additional_stops_)
+      .def_readwrite("total_runs", &vdv_aus::statistics::total_runs_)
+      .def_readwrite("complete_runs", &vdv_aus::statistics::complete_runs_)
+      .def_readwrite("unique_runs", &vdv_aus::statistics::unique_runs_)
+      .def_readwrite("match_attempts", &vdv_aus::statistics::match_attempts_)
+      .def_readwrite("matched_runs", &vdv_aus::statistics::matched_runs_)
+      .def_readwrite("found_runs", &vdv_aus::statistics::found_runs_)
+      .def_readwrite("multiple_matches", &vdv_aus::statistics::multiple_matches_)
+      .def_readwrite("no_transport_found_at_stop",
+                     &vdv_aus::statistics::no_transport_found_at_stop_)
+      .def_readwrite("total_stops", &vdv_aus::statistics::total_stops_)
+      .def_readwrite("resolved_stops", &vdv_aus::statistics::resolved_stops_)
+      .def_readwrite("cancelled_runs", &vdv_aus::statistics::cancelled_runs_)
+      .def_readwrite("updated_events", &vdv_aus::statistics::updated_events_)
+      .def_readwrite("propagated_delays",
+                     &vdv_aus::statistics::propagated_delays_)
+      .def_readwrite("error", &vdv_aus::statistics::error_)
+      .def("__repr__", [](vdv_aus::statistics const& s) {
+        return "VdvAusStatistics(runs=" + std::to_string(s.total_runs_) +
+               ", matched=" + std::to_string(s.matched_runs_) +
+               ", updated_events=" + std::to_string(s.updated_events_) + ")";
+      });
+
+  // VDV AUS / SIRI updater
+  py::class_<vdv_aus::updater> vdv_updater(m, "VdvAusUpdater");
+
+  py::enum_<vdv_aus::updater::xml_format>(vdv_updater, "Format")
+      .value("VDV", vdv_aus::updater::xml_format::kVdv)
+      .value("SIRI", vdv_aus::updater::xml_format::kSiri)
+      .value("SIRI_JSON", vdv_aus::updater::xml_format::kSiriJson)
+      .export_values();
+
+  // Keeps run matches between messages, so reuse one updater per feed.
+  vdv_updater
+      .def(py::init<timetable const&, source_idx_t,
+                    vdv_aus::updater::xml_format>(),
+           py::arg("timetable"),
+           py::arg("source"),
+           py::arg("format") = vdv_aus::updater::xml_format::kVdv,
+           py::keep_alive<1, 2>())
+      .def("update",
+           [](vdv_aus::updater& u, rt_timetable& rtt,
+              py::buffer const& data) -> vdv_aus::statistics {
+             // Keep the GIL: it serializes all access to the rt_timetable
+             // and the updater's run matches.
+             auto const info = request_contiguous(data);
+             auto const payload = to_view(info);
+             auto const parse_error = [] {
+               auto stats = vdv_aus::statistics{};
+               stats.error_ = true;
+               return stats;
+             };
+             auto doc = pugi::xml_document{};
+             if (u.get_format() == vdv_aus::updater::xml_format::kSiriJson) {
+               try {
+                 doc = to_xml(payload);
+               } catch (std::exception const&) {
+                 return parse_error();
+               }
+             } else if (!doc.load_buffer(payload.data(), payload.size())) {
+               return parse_error();
+             }
+             return u.update(rtt, doc);
+           },
+           py::arg("rt_timetable"),
+           py::arg("data"),
+           "Apply VDV AUS / SIRI message (bytes, bytearray or memoryview)")
+      .def("reset_run_ids", &vdv_aus::updater::reset_vdv_run_ids_,
+           "Forget all matched runs")
+      .def_property_readonly("cumulative_stats",
+                             &vdv_aus::updater::get_cumulative_stats)
+      .def_property_readonly("source", &vdv_aus::updater::get_src)
+      .def_property_readonly("format", &vdv_aus::updater::get_format)
+      .def("__repr__", [](vdv_aus::updater const& u) {
+        return "VdvAusUpdater(source=" + std::to_string(u.get_src().v_) + ")";
+      });
 }
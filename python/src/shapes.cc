@@ -0,0 +1,188 @@
+#include "pybind_common.h"
+
+#include <pybind11/numpy.h>
+
+#include "nigiri/routing/journey.h"
+#include "nigiri/rt/frun.h"
+#include "nigiri/rt/rt_timetable.h"
+#include "nigiri/shapes_storage.h"
+#include "nigiri/timetable.h"
+
+#include "geo/box.h"
+#include "geo/latlng.h"
+
+#include "utl/overloaded.h"
+
+#include <memory>
+#include <optional>
+#include <span>
+#include <string>
+#include <variant>
+#include <vector>
+
+namespace py = pybind11;
+using namespace nigiri;
+
+namespace {
+
+static_assert(sizeof(geo::latlng) == 2U * sizeof(double),
+              "geo::latlng must be two packed doubles for (n, 2) views");
+
+// (n, 2) [lat, lng] view into the shapes memory, kept alive by base.
+py::array_t<double> shape_view(std::span<geo::latlng const> shape,
+                               py::handle base) {
+  auto arr = py::array_t<double>(
+      {static_cast<py::ssize_t>(shape.size()), py::ssize_t{2}},
+      {static_cast<py::ssize_t>(sizeof(geo::latlng)),
+       static_cast<py::ssize_t>(sizeof(double))},
+      shape.empty() ? nullptr : &shape.front().lat_, base);
+  arr.attr("setflags")(py::arg("write") = false);
+  return arr;
+}
+
+// (n, 2) [lat, lng] array owning a copy of the given points.
+py::array_t<double> shape_copy(std::vector<geo::latlng> const& points) {
+  auto arr = py::array_t<double>(
+      {static_cast<py::ssize_t>(points.size()), py::ssize_t{2}});
+  auto out = arr.mutable_unchecked<2>();
+  for (auto i = py::ssize_t{0}; i != out.shape(0); ++i) {
+    out(i, 0) = points[static_cast<std::size_t>(i)].lat_;
+    out(i, 1) = points[static_cast<std::size_t>(i)].lng_;
+  }
+  return arr;
+}
+
+// Views into a writable storage dangle once the storage grows: copy then.
+py::array_t<double> shape_array(shapes_storage const& shapes,
+                                std::span<geo::latlng const> shape,
+                                py::handle base) {
+  if (shapes.mode_ == cista::mmap::protection::WRITE) {
+    return shape_copy({begin(shape), end(shape)});
+  }
+  return shape_view(shape, base);
+}
+
+py::array_t<double> leg_shape(timetable const& tt,
+                              rt_timetable const* rtt,
+                              shapes_storage const& shapes,
+                              py::handle shapes_handle,
+                              routing::journey::leg const& l) {
+  return std::visit(
+      utl::overloaded{
+          [&](routing::journey::run_enter_exit const& ree) {
+            auto const fr = rt::frun{tt, rtt, ree.r_};
+            auto const leg_range = ree.stop_range_ >> ree.r_.stop_range_.from_;
+
+            // Zero-copy if the leg stays within one trip that has a shape.
+            auto view = std::optional<std::span<geo::latlng const>>{};
+            fr.for_each_trip([&](trip_idx_t const trip_idx,
+                                 interval<stop_idx_t> const subrange) {
+              if (trip_idx != trip_idx_t::invalid() &&
+                  subrange.contains(leg_range)) {
+                auto const shape =
+                    shapes.get_shape(trip_idx, leg_range << subrange.from_);
+                if (!shape.empty()) {
+                  view = shape;
+                }
+              }
+            });
+            if (view.has_value()) {
+              return shape_array(shapes, *view, shapes_handle);
+            }
+
+            auto points = std::vector<geo::latlng>{};
+            fr.for_each_shape_point(
+                &shapes, ree.stop_range_,
+                [&](geo::latlng const& pos) { points.push_back(pos); });
+            return shape_copy(points);
+          },
+          [&](auto const&) {
+            return shape_copy({tt.locations_.coordinates_[l.from_],
+                               tt.locations_.coordinates_[l.to_]});
+          }},
+      l.uses_);
+}
+
+}  // namespace
+
+void init_shapes(py::module_& m) {
+  // Shapes storage (memory mapped)
+  py::class_<shapes_storage>(m, "ShapesStorage")
+      .def(py::init([](std::string const& path, bool const read_only) {
+             return std::make_unique<shapes_storage>(
+                 path, read_only ? cista::mmap::protection::READ
+                                 : cista::mmap::protection::WRITE);
+           }),
+           py::arg("path"),
+           py::arg("read_only") = true,
+           "Open shapes directory. Use read_only=False to fill it with "
+           "load_timetable.")
+      .def("n_shapes",
+           [](shapes_storage const& s) { return s.data_.size(); },
+           "Get number of stored shapes")
+      .def("get_shape",
+           [](py::object const& self, trip_idx_t const trip_idx) {
+             auto const& s = self.cast<shapes_storage const&>();
+             return shape_array(s, s.get_shape(trip_idx), self);
+           },
+           py::arg("trip_idx"),
+           "Get trip shape as read-only (n, 2) [lat, lng] view")
+      .def("get_shape",
+           [](py::object const& self, trip_idx_t const trip_idx,
+              stop_idx_t const from, stop_idx_t const to) {
+             auto const& s = self.cast<shapes_storage const&>();
+             // shapes_storage::get_shape does not check the stop range.
+             if (trip_idx != trip_idx_t::invalid() &&
+                 trip_idx < s.trip_offset_indices_.size()) {
+               auto const offset_idx = s.trip_offset_indices_[trip_idx].second;
+               if (offset_idx != shape_offset_idx_t::invalid() &&
+                   (from >= to || to > s.offsets_[offset_idx].size())) {
+                 throw py::index_error("stop range out of bounds");
+               }
+             }
+             return shape_array(
+                 s, s.get_shape(trip_idx, interval<stop_idx_t>{from, to}),
+                 self);
+           },
+           py::arg("trip_idx"),
+           py::arg("from_stop"),
+           py::arg("to_stop"),
+           "Get trip shape between two stops (end exclusive) as read-only "
+           "(n, 2) [lat, lng] view")
+      .def("get_bounding_box",
+           [](shapes_storage const& s, route_idx_t const r) {
+             auto const b = s.get_bounding_box(r);
+             return py::make_tuple(b.min_, b.max_);
+           },
+           py::arg("route_idx"),
+           "Get route bounding box as (min, max) LatLng tuple")
+      .def("__repr__", [](shapes_storage const& s) {
+        return "ShapesStorage(path='" + s.p_.generic_string() +
+               "', shapes=" + std::to_string(s.data_.size()) + ")";
+      });
+
+  // Leg geometries for a batch of journeys
+  m.def("get_leg_shapes",
+        [](timetable const& tt,
+           py::object const& shapes_handle,
+           std::vector<routing::journey> const& journeys,
+           rt_timetable const* rtt) {
+          auto const& shapes = shapes_handle.cast<shapes_storage const&>();
+          auto result = py::list{};
+          for (auto const& j : journeys) {
+            auto legs = py::list{};
+            for (auto const& l : j.legs_) {
+              legs.append(leg_shape(tt, rtt, shapes, shapes_handle, l));
+            }
+            result.append(std::move(legs));
+          }
+          return result;
+        },
+        py::arg("timetable"),
+        py::arg("shapes"),
+        py::arg("journeys"),
+        py::arg("rt_timetable") = nullptr,
+        "Get (n, 2) [lat, lng] geometry for every leg of every journey. "
+        "Legs within a single shaped trip are read-only views into the "
+        "shapes storage, all other legs are copies.");
+}
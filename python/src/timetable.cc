@@ -1,17 +1,174 @@
 #include "pybind_common.h"
 
+#include <pybind11/numpy.h>
+
 #include "nigiri/timetable.h"
 #include "nigiri/string_store.h"
 
+#include "cista/memory_holder.h"
+
 #include "geo/latlng.h"
 
+#include <algorithm>
+#include <cstdint>
+#include <cstring>
+#include <filesystem>
+#include <memory>
 #include <optional>
 #include <string>
 #include <string_view>
+#include <tuple>
+#include <vector>
 
 namespace py = pybind11;
 using namespace nigiri;
 
+namespace {
+
+// Serialized timetable owned by C++, exported through the buffer protocol.
+struct timetable_buffer {
+  cista::byte_buf buf_;
+};
+
+timetable_buffer serialize(timetable const& tt) {
+  auto mem = cista::memory_holder{cista::byte_buf{}};
+  tt.write(mem);
+  return timetable_buffer{std::move(std::get<cista::byte_buf>(mem))};
+}
+
+std::shared_ptr<timetable> deserialize(py::buffer const& b) {
+  auto const info = request_contiguous(b);
+  auto const size = static_cast<std::size_t>(info.size * info.itemsize);
+
+  // Deserialization fixes up pointers in place -> needs its own copy.
+  auto buf = cista::byte_buf(size);
+  std::memcpy(buf.data(), info.ptr, size);
+
+  py::gil_scoped_release release;
+  auto const wrapped = std::make_shared<cista::wrapped<timetable>>(
+      timetable::read(cista::memory_holder{std::move(buf)}));
+  return std::shared_ptr<timetable>{wrapped, &**wrapped};
+}
+
+// Arrow (large_)string array: resolve straight from its offsets/data buffers.
+template <typename Offset, typename Fn>
+void resolve_arrow_ids(py::handle arr, std::int64_t* out, Fn&& resolve) {
+  auto const buffers = arr.attr("buffers")().cast<py::list>();
+  auto const offset = arr.attr("offset").cast<std::size_t>();
+  auto const n = py::len(arr);
+  auto const validity =
+      buffers[0].is_none()
+          ? std::optional<py::buffer_info>{}
+          : std::optional{buffers[0].cast<py::buffer>().request()};
+  auto const offsets = buffers[1].cast<py::buffer>().request();
+  auto const data = buffers[2].is_none()
+                        ? std::optional<py::buffer_info>{}
+                        : std::optional{buffers[2].cast<py::buffer>().request()};
+
+  py::gil_scoped_release release;
+  auto const bits =
+      validity ? static_cast<std::uint8_t const*>(validity->ptr) : nullptr;
+  auto const offs = static_cast<Offset const*>(offsets.ptr);
+  auto const chars = data ? static_cast<char const*>(data->ptr) : nullptr;
+  for (auto i = std::size_t{0U}; i != n; ++i) {
+    auto const j = offset + i;
+    if (bits != nullptr && ((bits[j / 8U] >> (j % 8U)) & 1U) == 0U) {
+      out[i] = -1;
+      continue;
+    }
+    out[i] = resolve(std::string_view{
+        chars + offs[j], static_cast<std::size_t>(offs[j + 1] - offs[j])});
+  }
+}
+
+// Resolves an Arrow array straight from its buffers.
+template <typename Fn>
+void resolve_arrow_chunk(py::handle chunk, std::int64_t* out, Fn&& resolve) {
+  auto const type = py::str(chunk.attr("type")).cast<std::string>();
+  if (type == "string" || type == "utf8") {
+    resolve_arrow_ids<std::int32_t>(chunk, out, resolve);
+  } else if (type == "large_string" || type == "large_utf8") {
+    resolve_arrow_ids<std::int64_t>(chunk, out, resolve);
+  } else {
+    // Other Arrow types (string_view, dictionary, ...) iterate as scalars,
+    // not str/None: let Arrow convert them to a plain string array first.
+    auto converted = py::object{};
+    try {
+      converted = chunk.attr("cast")(
+          py::module_::import("pyarrow").attr("string")());
+    } catch (py::error_already_set const&) {
+      throw py::type_error("unsupported Arrow type for IDs: " + type);
+    }
+    resolve_arrow_ids<std::int32_t>(converted, out, resolve);
+  }
+}
+
+// Resolves each ID of a pyarrow (Chunked)Array or any iterable of str/None
+// (list, generator, ...) to an index, -1 for misses and None.
+template <typename Fn>
+py::array_t<std::int64_t> resolve_ids(py::handle ids, Fn&& resolve) {
+  auto const is_arrow = [](py::handle h) {
+    return py::hasattr(h, "type") &&
+           (py::hasattr(h, "chunks") || py::hasattr(h, "buffers"));
+  };
+
+  if (is_arrow(ids)) {
+    auto result = py::array_t<std::int64_t>(
+        static_cast<py::ssize_t>(py::len(ids)));
+    auto out = result.mutable_data();
+    if (py::hasattr(ids, "chunks")) {
+      for (auto const chunk : ids.attr("chunks")) {
+        resolve_arrow_chunk(chunk, out, resolve);
+        out += py::len(chunk);
+      }
+    } else {
+      resolve_arrow_chunk(ids, out, resolve);
+    }
+    return result;
+  }
+
+  auto indices = std::vector<std::int64_t>{};
+  for (auto const id : ids) {
+    if (id.is_none()) {
+      indices.push_back(-1);
+    } else if (py::isinstance<py::str>(id)) {
+      indices.push_back(resolve(id.cast<std::string>()));
+    } else {
+      throw py::type_error("ids[" + std::to_string(indices.size()) +
+                           "]: expected str or None, got " +
+                           py::repr(id).cast<std::string>());
+    }
+  }
+  return py::array_t<std::int64_t>(static_cast<py::ssize_t>(indices.size()),
+                                   indices.data());
+}
+
+std::int64_t find_location_idx(timetable const& tt,
+                               std::string_view id,
+                               source_idx_t const src) {
+  auto const l = tt.find(location_id{id, src});
+  return l.has_value() ? static_cast<std::int64_t>(to_idx(*l)) : -1;
+}
+
+std::int64_t find_trip_idx(timetable const& tt,
+                           std::string_view id,
+                           source_idx_t const src) {
+  auto const lb = std::lower_bound(
+      begin(tt.trip_id_to_idx_), end(tt.trip_id_to_idx_), id,
+      [&](pair<trip_id_idx_t, trip_idx_t> const& a, std::string_view b) {
+        return std::tuple{tt.trip_id_src_[a.first],
+                          tt.trip_id_strings_[a.first].view()} <
+               std::tuple{src, b};
+      });
+  if (lb == end(tt.trip_id_to_idx_) || tt.trip_id_src_[lb->first] != src ||
+      tt.trip_id_strings_[lb->first].view() != id) {
+    return -1;
+  }
+  return static_cast<std::int64_t>(to_idx(lb->second));
+}
+
+}  // namespace
+
 void init_timetable(py::module_& m) {
   // geo::latlng
   py::class_<geo::latlng>(m, "LatLng")
@@ -26,7 +183,9 @@ void init_timetable(py::module_& m) {
       .def(py::self == py::self);
 
   // Timetable - simplified binding focusing on key functionality
-  py::class_<timetable>(m, "Timetable")
+  // Held by shared_ptr so instances can alias a cista::wrapped<timetable>
+  // (see read_timetable) as well as own a freshly loaded timetable.
+  py::class_<timetable, std::shared_ptr<timetable>>(m, "Timetable")
       .def(py::init<>())
       
       // Location queries
@@ -39,6 +198,40 @@ void init_timetable(py::module_& m) {
            py::arg("src") = source_idx_t{0},
            "Find location by ID")
       
+      .def("find_locations",
+           [](timetable const& tt, py::object const& ids, source_idx_t src) {
+             return resolve_ids(ids, [&](std::string_view id) {
+               return find_location_idx(tt, id, src);
+             });
+           },
+           py::arg("ids"),
+           py::arg("src") = source_idx_t{0},
+           "Find locations by ID (iterable of str/None or Arrow string "
+           "array). Returns array of location indices, -1 if not found")
+      
+      .def("find_trip",
+           [](timetable const& tt, std::string const& id, source_idx_t src)
+           -> std::optional<trip_idx_t> {
+             auto const idx = find_trip_idx(tt, id, src);
+             return idx == -1 ? std::nullopt
+                              : std::optional{trip_idx_t{
+                                    static_cast<std::uint32_t>(idx)}};
+           },
+           py::arg("id"),
+           py::arg("src") = source_idx_t{0},
+           "Find trip by ID")
+      
+      .def("find_trips",
+           [](timetable const& tt, py::object const& ids, source_idx_t src) {
+             return resolve_ids(ids, [&](std::string_view id) {
+               return find_trip_idx(tt, id, src);
+             });
+           },
+           py::arg("ids"),
+           py::arg("src") = source_idx_t{0},
+           "Find trips by ID (iterable of str/None or Arrow string array). "
+           "Returns array of trip indices, -1 if not found")
+      
       .def("get_location_name",
            [](timetable const& tt, location_idx_t const loc) -> std::string {
              return std::string(tt.get_default_name(loc));
@@ -86,12 +279,46 @@ void init_timetable(py::module_& m) {
            },
            "Get timetable date range as (start_day, end_day) in days since epoch")
       
+      // Serialization
+      .def("write",
+           [](timetable const& tt, std::string const& path) {
+             tt.write(std::filesystem::path{path});
+           },
+           py::arg("path"),
+           "Write timetable as binary image (read back with read_timetable)")
+      .def("serialize",
+           &serialize,
+           py::call_guard<py::gil_scoped_release>(),
+           "Serialize timetable to a TimetableBuffer (buffer protocol)")
+      .def_static("from_buffer",
+                  &deserialize,
+                  py::arg("buffer"),
+                  "Deserialize timetable from any bytes-like object")
+      .def(py::pickle(
+          [](timetable const& tt) {
+            auto const b = serialize(tt);
+            return py::bytes(reinterpret_cast<char const*>(b.buf_.data()),
+                             b.buf_.size());
+          },
+          [](py::buffer const& state) { return deserialize(state); }))
+      
       .def("__repr__", [](timetable const& tt) {
         return "Timetable(locations=" + std::to_string(tt.locations_.coordinates_.size()) +
                ", routes=" + std::to_string(tt.route_transport_ranges_.size()) +
                ", transports=" + std::to_string(tt.transport_route_.size()) + ")";
       });
 
+  // Serialized timetable
+  py::class_<timetable_buffer>(m, "TimetableBuffer", py::buffer_protocol())
+      .def_buffer([](timetable_buffer& b) -> py::buffer_info {
+        return py::buffer_info(b.buf_.data(),
+                               static_cast<py::ssize_t>(b.buf_.size()));
+      })
+      .def("__len__", [](timetable_buffer const& b) { return b.buf_.size(); })
+      .def("__repr__", [](timetable_buffer const& b) {
+        return "TimetableBuffer(size=" + std::to_string(b.buf_.size()) + ")";
+      });
+
   // Transport info
   py::class_<timetable::transport>(m, "Transport")
       .def_readonly("bitfield_idx", &timetable::transport::bitfield_idx_)
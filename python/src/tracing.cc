@@ -0,0 +1,535 @@
+#include "pybind_common.h"
+
+#include "opentelemetry/context/runtime_context.h"
+#include "opentelemetry/nostd/shared_ptr.h"
+#include "opentelemetry/nostd/variant.h"
+#include "opentelemetry/trace/context.h"
+#include "opentelemetry/trace/noop.h"
+#include "opentelemetry/trace/provider.h"
+#include "opentelemetry/trace/span.h"
+#include "opentelemetry/trace/tracer.h"
+#include "opentelemetry/trace/tracer_provider.h"
+
+#include <array>
+#include <atomic>
+#include <chrono>
+#include <cstdint>
+#include <fstream>
+#include <memory>
+#include <mutex>
+#include <optional>
+#include <random>
+#include <ostream>
+#include <stdexcept>
+#include <string>
+#include <type_traits>
+#include <utility>
+#include <variant>
+#include <vector>
+
+namespace py = pybind11;
+namespace otel = opentelemetry;
+namespace nostd = opentelemetry::nostd;
+
+namespace {
+
+using attribute_t =
+    std::variant<bool, std::int64_t, std::uint64_t, double, std::string>;
+using attributes_t = std::vector<std::pair<std::string, attribute_t>>;
+
+struct finished_span {
+  struct event {
+    std::string name_;
+    std::int64_t time_ns_;
+    attributes_t attributes_;
+  };
+
+  std::string name_;
+  otel::trace::TraceId trace_id_;
+  otel::trace::SpanId span_id_, parent_span_id_;
+  std::int64_t start_ns_{0}, end_ns_{0};
+  attributes_t attributes_;
+  std::vector<event> events_;
+  otel::trace::StatusCode status_{otel::trace::StatusCode::kUnset};
+  std::string status_description_;
+};
+
+std::int64_t now_ns() {
+  return std::chrono::duration_cast<std::chrono::nanoseconds>(
+             std::chrono::system_clock::now().time_since_epoch())
+      .count();
+}
+
+std::int64_t to_ns(otel::common::SystemTimestamp const t) {
+  return static_cast<std::int64_t>(t.time_since_epoch().count());
+}
+
+attribute_t to_attribute(otel::common::AttributeValue const& v) {
+  return nostd::visit(
+      [](auto const& x) -> attribute_t {
+        using T = std::decay_t<decltype(x)>;
+        if constexpr (std::is_same_v<T, bool>) {
+          return x;
+        } else if constexpr (std::is_integral_v<T> && std::is_signed_v<T>) {
+          return static_cast<std::int64_t>(x);
+        } else if constexpr (std::is_integral_v<T>) {
+          return static_cast<std::uint64_t>(x);
+        } else if constexpr (std::is_floating_point_v<T>) {
+          return static_cast<double>(x);
+        } else if constexpr (std::is_same_v<T, char const*>) {
+          return std::string{x};
+        } else if constexpr (std::is_same_v<T, nostd::string_view>) {
+          return std::string{x.data(), x.size()};
+        } else {
+          return std::string{"<array>"};
+        }
+      },
+      v);
+}
+
+attributes_t to_attributes(otel::common::KeyValueIterable const& kv) {
+  auto attributes = attributes_t{};
+  kv.ForEachKeyValue([&](nostd::string_view const key,
+                         otel::common::AttributeValue const& value) {
+    attributes.emplace_back(std::string{key.data(), key.size()},
+                            to_attribute(value));
+    return true;
+  });
+  return attributes;
+}
+
+template <typename Id>
+std::string to_hex(Id const& id) {
+  auto hex = std::array<char, 2U * Id::kSize>{};
+  id.ToLowerBase16(hex);
+  return std::string{hex.data(), hex.size()};
+}
+
+template <typename Id>
+Id random_id() {
+  thread_local auto rng = std::mt19937_64{std::random_device{}()};
+  auto bytes = std::array<std::uint8_t, Id::kSize>{};
+  for (auto& b : bytes) {
+    b = static_cast<std::uint8_t>(rng());
+  }
+  return Id{bytes};
+}
+
+// --- JSON (OTLP file format) ---
+
+void write_json_str(std::ostream& out, std::string_view s) {
+  out << '"';
+  for (auto const c : s) {
+    switch (c) {
+      case '"': out << "\\\""; break;
+      case '\\': out << "\\\\"; break;
+      case '\n': out << "\\n"; break;
+      case '\r': out << "\\r"; break;
+      case '\t': out << "\\t"; break;
+      default:
+        if (static_cast<unsigned char>(c) < 0x20U) {
+          constexpr auto const kHex = "0123456789abcdef";
+          out << "\\u00" << kHex[(c >> 4) & 0xF] << kHex[c & 0xF];
+        } else {
+          out << c;
+        }
+    }
+  }
+  out << '"';
+}
+
+void write_json_attributes(std::ostream& out, attributes_t const& attributes) {
+  out << '[';
+  auto first = true;
+  for (auto const& [key, value] : attributes) {
+    out << (first ? "" : ",") << "{\"key\":";
+    write_json_str(out, key);
+    out << ",\"value\":{";
+    std::visit(
+        [&](auto const& x) {
+          using T = std::decay_t<decltype(x)>;
+          if constexpr (std::is_same_v<T, bool>) {
+            out << "\"boolValue\":" << (x ? "true" : "false");
+          } else if constexpr (std::is_integral_v<T>) {
+            out << "\"intValue\":\"" << x << '"';
+          } else if constexpr (std::is_floating_point_v<T>) {
+            out << "\"doubleValue\":" << x;
+          } else {
+            out << "\"stringValue\":";
+            write_json_str(out, x);
+          }
+        },
+        value);
+    out << "}}";
+    first = false;
+  }
+  out << ']';
+}
+
+// One ExportTraceServiceRequest per line, like the OTLP file exporter.
+void write_otlp_json(std::ostream& out, finished_span const& s) {
+  out << R"({"resourceSpans":[{"resource":{"attributes":[{"key":"service.name","value":{"stringValue":"pynigiri"}}]},"scopeSpans":[{"scope":{"name":"nigiri"},"spans":[{)";
+  out << "\"traceId\":\"" << to_hex(s.trace_id_) << "\",\"spanId\":\""
+      << to_hex(s.span_id_) << '"';
+  if (s.parent_span_id_.IsValid()) {
+    out << ",\"parentSpanId\":\"" << to_hex(s.parent_span_id_) << '"';
+  }
+  out << ",\"name\":";
+  write_json_str(out, s.name_);
+  out << ",\"kind\":1,\"startTimeUnixNano\":\"" << s.start_ns_
+      << "\",\"endTimeUnixNano\":\"" << s.end_ns_ << "\",\"attributes\":";
+  write_json_attributes(out, s.attributes_);
+  out << ",\"events\":[";
+  for (auto i = 0U; i != s.events_.size(); ++i) {
+    out << (i == 0U ? "" : ",") << "{\"timeUnixNano\":\""
+        << s.events_[i].time_ns_ << "\",\"name\":";
+    write_json_str(out, s.events_[i].name_);
+    out << ",\"attributes\":";
+    write_json_attributes(out, s.events_[i].attributes_);
+    out << '}';
+  }
+  out << "],\"status\":{\"code\":"
+      << (s.status_ == otel::trace::StatusCode::kOk      ? 1
+          : s.status_ == otel::trace::StatusCode::kError ? 2
+                                                         : 0);
+  if (!s.status_description_.empty()) {
+    out << ",\"message\":";
+    write_json_str(out, s.status_description_);
+  }
+  out << "}}]}]}]}\n";
+}
+
+// --- Python representation ---
+
+py::object to_py(attribute_t const& a) {
+  return std::visit([](auto const& x) -> py::object { return py::cast(x); },
+                    a);
+}
+
+py::dict to_py(attributes_t const& attributes) {
+  auto d = py::dict{};
+  for (auto const& [key, value] : attributes) {
+    d[py::str(key)] = to_py(value);
+  }
+  return d;
+}
+
+py::dict to_py(finished_span const& s) {
+  auto d = py::dict{};
+  d["name"] = s.name_;
+  d["trace_id"] = to_hex(s.trace_id_);
+  d["span_id"] = to_hex(s.span_id_);
+  d["parent_span_id"] = s.parent_span_id_.IsValid()
+                            ? py::object{py::str(to_hex(s.parent_span_id_))}
+                            : py::object{py::none()};
+  d["start_time_unix_nano"] = s.start_ns_;
+  d["end_time_unix_nano"] = s.end_ns_;
+  d["attributes"] = to_py(s.attributes_);
+  auto events = py::list{};
+  for (auto const& e : s.events_) {
+    events.append(py::make_tuple(e.name_, e.time_ns_, to_py(e.attributes_)));
+  }
+  d["events"] = events;
+  d["status"] = s.status_ == otel::trace::StatusCode::kOk      ? "ok"
+                : s.status_ == otel::trace::StatusCode::kError ? "error"
+                                                               : "unset";
+  d["status_description"] = s.status_description_;
+  return d;
+}
+
+// --- Exporter ---
+
+// Finished spans are buffered and exported in one batch when a root span ends
+// (or on flush), so encoding, file I/O and the Python callback do not add to
+// the measured duration of the enclosing spans.
+struct exporter {
+  static constexpr auto const kMaxBuffered = 4096U;
+
+  exporter(std::optional<std::string> const& path, py::object callback)
+      : callback_{std::move(callback)} {
+    if (path.has_value()) {
+      file_.open(*path, std::ios::out | std::ios::app);
+      if (!file_) {
+        throw std::runtime_error("Cannot open file: " + *path);
+      }
+    }
+  }
+
+  exporter(exporter const&) = delete;
+  exporter& operator=(exporter const&) = delete;
+
+  ~exporter() {
+    flush();
+    if (Py_IsInitialized()) {
+      py::gil_scoped_acquire acquire;
+      callback_ = py::none();
+    } else {
+      callback_.release();
+    }
+  }
+
+  void add(finished_span&& s) noexcept {
+    auto const is_root = !s.parent_span_id_.IsValid();
+    auto full = false;
+    {
+      auto const lock = std::scoped_lock{mutex_};
+      buffered_.emplace_back(std::move(s));
+      full = buffered_.size() >= kMaxBuffered;
+    }
+    if (is_root || full) {
+      flush();
+    }
+  }
+
+  void flush() noexcept {
+    if (!Py_IsInitialized()) {
+      return;
+    }
+
+    // Lock order: GIL before mutex_. Ending a span only takes mutex_.
+    py::gil_scoped_acquire acquire;
+    auto spans = std::vector<finished_span>{};
+    {
+      auto const lock = std::scoped_lock{mutex_};
+      spans.swap(buffered_);
+    }
+    if (spans.empty()) {
+      return;
+    }
+
+    if (file_.is_open()) {
+      for (auto const& s : spans) {
+        write_otlp_json(file_, s);
+      }
+      file_.flush();
+    }
+
+    if (!callback_.is_none()) {
+      for (auto const& s : spans) {
+        try {
+          callback_(to_py(s));
+        } catch (py::error_already_set& e) {
+          e.discard_as_unraisable("pynigiri tracing callback");
+        } catch (...) {
+        }
+      }
+    }
+  }
+
+  std::mutex mutex_;
+  std::vector<finished_span> buffered_;
+  std::ofstream file_;
+  py::object callback_;
+};
+
+class span final : public otel::trace::Span {
+public:
+  span(std::shared_ptr<exporter> e, finished_span data)
+      : exporter_{std::move(e)}, data_{std::move(data)} {}
+
+  span(span const&) = delete;
+  span& operator=(span const&) = delete;
+
+  ~span() override { End(); }
+
+  void SetAttribute(nostd::string_view key,
+                    otel::common::AttributeValue const& value) noexcept
+      override {
+    auto const lock = std::scoped_lock{mutex_};
+    data_.attributes_.emplace_back(std::string{key.data(), key.size()},
+                                   to_attribute(value));
+  }
+
+  void AddEvent(nostd::string_view name) noexcept override {
+    add_event(name, now_ns(), {});
+  }
+
+  void AddEvent(nostd::string_view name,
+                otel::common::SystemTimestamp timestamp) noexcept override {
+    add_event(name, to_ns(timestamp), {});
+  }
+
+  void AddEvent(nostd::string_view name,
+                otel::common::SystemTimestamp timestamp,
+                otel::common::KeyValueIterable const& attributes) noexcept
+      override {
+    add_event(name, to_ns(timestamp), to_attributes(attributes));
+  }
+
+#if OPENTELEMETRY_ABI_VERSION_NO >= 2
+  void AddLink(otel::trace::SpanContext const&,
+               otel::common::KeyValueIterable const&) noexcept override {}
+
+  void AddLinks(
+      otel::trace::SpanContextKeyValueIterable const&) noexcept override {}
+#endif
+
+  void SetStatus(otel::trace::StatusCode code,
+                 nostd::string_view description = "") noexcept override {
+    auto const lock = std::scoped_lock{mutex_};
+    data_.status_ = code;
+    data_.status_description_ =
+        std::string{description.data(), description.size()};
+  }
+
+  void UpdateName(nostd::string_view name) noexcept override {
+    auto const lock = std::scoped_lock{mutex_};
+    data_.name_ = std::string{name.data(), name.size()};
+  }
+
+  void End(otel::trace::EndSpanOptions const& = {}) noexcept override {
+    if (ended_.exchange(true)) {
+      return;
+    }
+    auto data = finished_span{};
+    {
+      auto const lock = std::scoped_lock{mutex_};
+      data_.end_ns_ = now_ns();
+      data = std::move(data_);  // ids stay valid for GetContext
+    }
+    exporter_->add(std::move(data));
+  }
+
+  otel::trace::SpanContext GetContext() const noexcept override {
+    return otel::trace::SpanContext{
+        data_.trace_id_, data_.span_id_,
+        otel::trace::TraceFlags{otel::trace::TraceFlags::kIsSampled}, false};
+  }
+
+  bool IsRecording() const noexcept override { return !ended_; }
+
+private:
+  void add_event(nostd::string_view name,
+                 std::int64_t const time_ns,
+                 attributes_t attributes) {
+    auto const lock = std::scoped_lock{mutex_};
+    data_.events_.push_back({std::string{name.data(), name.size()}, time_ns,
+                             std::move(attributes)});
+  }
+
+  std::shared_ptr<exporter> exporter_;
+  std::mutex mutex_;
+  std::atomic_bool ended_{false};
+  finished_span data_;
+};
+
+class tracer final : public otel::trace::Tracer {
+public:
+  explicit tracer(std::shared_ptr<exporter> e) : exporter_{std::move(e)} {}
+
+  nostd::shared_ptr<otel::trace::Span> StartSpan(
+      nostd::string_view name,
+      otel::common::KeyValueIterable const& attributes,
+      otel::trace::SpanContextKeyValueIterable const&,
+      otel::trace::StartSpanOptions const& options) noexcept override {
+    // nigiri activates every span with a Scope -> parent is the active span.
+    auto const parent =
+        otel::trace::GetSpan(otel::context::RuntimeContext::GetCurrent())
+            ->GetContext();
+
+    auto data = finished_span{};
+    data.name_ = std::string{name.data(), name.size()};
+    data.trace_id_ = parent.IsValid()
+                         ? parent.trace_id()
+                         : random_id<otel::trace::TraceId>();
+    data.span_id_ = random_id<otel::trace::SpanId>();
+    data.parent_span_id_ =
+        parent.IsValid() ? parent.span_id() : otel::trace::SpanId{};
+    data.start_ns_ = options.start_system_time.time_since_epoch().count() != 0
+                         ? to_ns(options.start_system_time)
+                         : now_ns();
+    data.attributes_ = to_attributes(attributes);
+    return nostd::shared_ptr<otel::trace::Span>{
+        new span{exporter_, std::move(data)}};
+  }
+
+#if OPENTELEMETRY_ABI_VERSION_NO == 1
+  void ForceFlushWithMicroseconds(std::uint64_t) noexcept override {}
+  void CloseWithMicroseconds(std::uint64_t) noexcept override {}
+#endif
+
+private:
+  std::shared_ptr<exporter> exporter_;
+};
+
+class tracer_provider final : public otel::trace::TracerProvider {
+public:
+  explicit tracer_provider(std::shared_ptr<exporter> e)
+      : tracer_{new tracer{std::move(e)}} {}
+
+#if OPENTELEMETRY_ABI_VERSION_NO >= 2
+  nostd::shared_ptr<otel::trace::Tracer> GetTracer(
+      nostd::string_view,
+      nostd::string_view,
+      nostd::string_view,
+      otel::common::KeyValueIterable const*) noexcept override {
+    return tracer_;
+  }
+#else
+  nostd::shared_ptr<otel::trace::Tracer> GetTracer(
+      nostd::string_view,
+      nostd::string_view,
+      nostd::string_view) noexcept override {
+    return tracer_;
+  }
+#endif
+
+private:
+  nostd::shared_ptr<otel::trace::Tracer> tracer_;
+};
+
+std::shared_ptr<exporter>& active_exporter() {
+  static auto e = std::shared_ptr<exporter>{};
+  return e;
+}
+
+void disable_tracing() {
+  otel::trace::Provider::SetTracerProvider(
+      nostd::shared_ptr<otel::trace::TracerProvider>{
+          new otel::trace::NoopTracerProvider{}});
+  if (auto const e = std::exchange(active_exporter(), nullptr); e != nullptr) {
+    e->flush();
+  }
+}
+
+void enable_tracing(std::optional<std::string> const& file,
+                    py::object callback) {
+  if (!file.has_value() && callback.is_none()) {
+    throw py::value_error("enable_tracing: file or callback required");
+  }
+  auto e = std::make_shared<exporter>(file, std::move(callback));
+  disable_tracing();
+  active_exporter() = e;
+  otel::trace::Provider::SetTracerProvider(
+      nostd::shared_ptr<otel::trace::TracerProvider>{
+          new tracer_provider{std::move(e)}});
+}
+
+}  // namespace
+
+void init_tracing(py::module_& m) {
+  m.def("enable_tracing",
+        &enable_tracing,
+        py::arg("file") = py::none(),
+        py::arg("callback") = py::none(),
+        "Record OpenTelemetry spans of loading, real-time updates and "
+        "routing. Finished spans are exported in batches when their root "
+        "span ends: appended to file (OTLP JSON lines) and/or passed to "
+        "callback as dict.");
+
+  m.def("flush_tracing",
+        [] {
+          if (active_exporter() != nullptr) {
+            active_exporter()->flush();
+          }
+        },
+        "Export all buffered finished spans now");
+
+  m.def("disable_tracing",
+        &disable_tracing,
+        "Export buffered spans and stop recording spans");
+
+  // Do not call back into Python after the interpreter is gone.
+  py::module_::import("atexit").attr("register")(
+      py::cpp_function{&disable_tracing});
+}
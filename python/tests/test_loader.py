@@ -1,9 +1,54 @@
 """
 Unit tests for pynigiri loader functionality.
 """
+import gc
+
 import pytest
 import pynigiri as ng
 
+# In-memory GTFS feed: a source path starting with "\n#" is read as
+# "# file name" sections instead of a directory.
+SHAPES_FEED = """
+# agency.txt
+agency_id,agency_name,agency_url,agency_timezone
+AG,Agency,https://example.com,Europe/Berlin
+
+# stops.txt
+stop_id,stop_name,stop_lat,stop_lon
+A,A,1.0,1.0
+B,B,1.0,2.0
+C,C,1.0,3.0
+
+# calendar_dates.txt
+service_id,date,exception_type
+S1,20240101,1
+
+# routes.txt
+route_id,agency_id,route_short_name,route_long_name,route_type
+R1,AG,R1,,3
+
+# trips.txt
+route_id,service_id,trip_id,shape_id
+R1,S1,T1,SH1
+
+# stop_times.txt
+trip_id,arrival_time,departure_time,stop_id,stop_sequence
+T1,10:00:00,10:00:00,A,1
+T1,10:10:00,10:10:00,B,2
+T1,10:20:00,10:20:00,C,3
+
+# shapes.txt
+shape_id,shape_pt_lat,shape_pt_lon,shape_pt_sequence
+SH1,1.0,1.0,1
+SH1,0.5,1.5,2
+SH1,1.0,2.0,3
+SH1,0.5,2.5,4
+SH1,1.0,3.0,5
+"""
+
+# 2024-01-01T00:00:00Z in minutes since epoch
+DAY_START = 28401120
+
 
 def test_loader_config():
     """Test LoaderConfig creation."""
@@ -45,6 +90,171 @@ def test_timetable_source():
     assert source2.path == "/path2"
 
 
+def test_timetable_write_read(tmp_path):
+    """Test writing and reading back a timetable image."""
+    path = str(tmp_path / "tt.bin")
+    ng.Timetable().write(path)
+
+    timetable = ng.read_timetable(path)
+    assert timetable is not None
+    assert timetable.n_locations() == 0
+
+
+def test_timetable_pickle():
+    """Test pickling a timetable and the buffer protocol export."""
+    import pickle
+
+    timetable = pickle.loads(pickle.dumps(ng.Timetable()))
+    assert timetable.n_locations() == 0
+
+    buf = ng.Timetable().serialize()
+    assert len(memoryview(buf)) == len(buf)
+    assert ng.Timetable.from_buffer(buf).n_locations() == 0
+    with pytest.raises(BufferError):
+        ng.Timetable.from_buffer(memoryview(bytes(buf))[::-1])
+
+
+def test_shapes_storage(tmp_path):
+    """Test creating an empty shapes storage."""
+    shapes = ng.ShapesStorage(str(tmp_path / "shapes"), read_only=False)
+    assert shapes is not None
+    assert shapes.n_shapes() == 0
+
+
+def test_shapes_storage_read_only(tmp_path):
+    """Test that the loader rejects a read-only shapes storage."""
+    ng.ShapesStorage(str(tmp_path / "shapes"), read_only=False)
+    shapes = ng.ShapesStorage(str(tmp_path / "shapes"))
+    with pytest.raises(ValueError):
+        ng.load_timetable([], "2024-01-01", "2024-01-31", shapes=shapes)
+
+
+def test_leg_shapes(tmp_path):
+    """Test shape views of a loaded feed with shapes.txt."""
+    np = pytest.importorskip("numpy")
+    path = str(tmp_path / "shapes")
+    writable = ng.ShapesStorage(path, read_only=False)
+    timetable = ng.load_timetable(
+        [ng.TimetableSource("test", SHAPES_FEED)],
+        "2024-01-01",
+        "2024-01-02",
+        shapes=writable,
+    )
+    del writable
+
+    shapes = ng.ShapesStorage(path)
+    assert shapes.n_shapes() == 1
+
+    trip = timetable.find_trip("T1")
+    assert trip is not None
+    assert shapes.get_shape(trip).shape == (5, 2)
+    assert np.array_equal(
+        shapes.get_shape(trip, 0, 2), [[1.0, 1.0], [0.5, 1.5], [1.0, 2.0]]
+    )
+    with pytest.raises(IndexError):
+        shapes.get_shape(trip, 1, 1)
+    with pytest.raises(IndexError):
+        shapes.get_shape(trip, 0, 4)
+    box_min, box_max = shapes.get_bounding_box(ng.RouteIdx(0))
+    assert (box_min.lat, box_min.lng) == (0.5, 1.0)
+    assert (box_max.lat, box_max.lng) == (1.0, 3.0)
+
+    a = timetable.find_location("A")
+    c = timetable.find_location("C")
+    query = ng.Query()
+    query.start_time = (DAY_START, DAY_START + 1440)
+    query.start = [ng.Offset(a, 0, 0)]
+    query.destination = [ng.Offset(c, 0, 0)]
+    journeys = ng.route(timetable, query)
+    assert len(journeys) == 1
+
+    legs = ng.get_leg_shapes(timetable, shapes, journeys)
+    assert len(legs) == 1
+    assert len(legs[0]) == len(journeys[0].legs)
+    views = [
+        (leg, arr)
+        for leg, arr in zip(journeys[0].legs, legs[0])
+        if arr.base is not None
+    ]
+    assert len(views) == 1
+    leg, arr = views[0]
+    assert not arr.flags.writeable
+    assert arr.shape == (5, 2)
+
+    def coords(loc):
+        ll = timetable.get_location_coords(loc)
+        return [ll.lat, ll.lng]
+
+    assert list(arr[0]) == coords(getattr(leg, "from"))
+    assert list(arr[-1]) == coords(leg.to)
+
+    # The view keeps the storage (and its mapping) alive.
+    del shapes
+    gc.collect()
+    assert list(arr[0]) == [1.0, 1.0]
+    assert list(arr[-1]) == [1.0, 3.0]
+
+
+def test_byte_sizes():
+    """Test byte size introspection of an empty timetable."""
+    sizes = ng.get_byte_sizes(ng.Timetable())
+    assert set(sizes) == {
+        "location_ids", "locations", "footpaths", "bitfields",
+        "route_stop_times", "route_location_seq", "transports", "trip_ids",
+        "trips", "route_ids", "lb_graph", "fares", "strings",
+    }
+    assert all(size > 0 for size in sizes.values())
+
+    rt_sizes = ng.get_rt_byte_sizes(ng.RtTimetable())
+    assert set(rt_sizes) == {
+        "rt_transports", "location_rt_transports", "bitfields",
+        "td_footpaths", "lb_graph", "alerts",
+    }
+    assert all(size > 0 for size in rt_sizes.values())
+
+
+def test_metrics():
+    """Test per-feed metrics of a loaded feed."""
+    sources = [
+        ng.TimetableSource("a", SHAPES_FEED),
+        ng.TimetableSource("b", SHAPES_FEED),
+    ]
+    timetable = ng.load_timetable(sources, "2024-01-01", "2024-01-02")
+    metrics = ng.get_metrics(timetable)
+    assert isinstance(metrics, list)
+    assert len(metrics) == len(sources)
+    for feed in metrics:
+        assert feed["locations"] == 3
+        assert feed["trips"] == 1
+        assert feed["transport_days"] == 1
+        assert feed["first_day"] <= feed["last_day"]
+
+
+def test_bulk_id_resolution():
+    """Test bulk ID resolution on an empty timetable."""
+    timetable = ng.Timetable()
+    assert list(timetable.find_locations(["a", "b"])) == [-1, -1]
+    assert list(timetable.find_trips(["a", None])) == [-1, -1]
+    assert timetable.find_trip("a") is None
+    assert list(timetable.find_locations(x for x in ["a", None])) == [-1, -1]
+    with pytest.raises(TypeError, match="ids\\[1\\]"):
+        timetable.find_trips(["a", float("nan")])
+
+
+def test_bulk_id_resolution_arrow():
+    """Test bulk ID resolution from Arrow string arrays."""
+    pa = pytest.importorskip("pyarrow")
+    timetable = ng.Timetable()
+    ids = pa.array(["a", None, "c"])
+    assert list(timetable.find_locations(ids)) == [-1, -1, -1]
+    chunked = pa.chunked_array([ids, pa.array(["d"])])
+    assert list(timetable.find_trips(chunked)) == [-1, -1, -1, -1]
+    large = pa.array(["a", None], type=pa.large_string())
+    assert list(timetable.find_locations(large)) == [-1, -1]
+    dictionary = pa.array(["a", None, "a"]).dictionary_encode()
+    assert list(timetable.find_trips(dictionary)) == [-1, -1, -1]
+
+
 # Note: Full integration test would require actual GTFS data
 # The following test is commented out as it requires real data
 
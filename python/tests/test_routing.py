@@ -5,6 +5,62 @@ import pytest
 import pynigiri as ng
 from datetime import timedelta, datetime
 
+# In-memory GTFS feed (path starting with "\n#"): line L1 (network N1, one
+# fare product) from A to B, line L2 (network N2, no fare rule) from B to C.
+FARES_FEED = """
+# agency.txt
+agency_id,agency_name,agency_url,agency_timezone
+AG,Agency,https://example.com,Europe/Berlin
+
+# stops.txt
+stop_id,stop_name,stop_lat,stop_lon
+A,A,1.0,1.0
+B,B,1.0,1.1
+C,C,1.0,1.2
+
+# calendar_dates.txt
+service_id,date,exception_type
+S1,20240101,1
+
+# routes.txt
+route_id,agency_id,route_short_name,route_long_name,route_type
+L1,AG,L1,,3
+L2,AG,L2,,3
+
+# trips.txt
+route_id,service_id,trip_id
+L1,S1,T1
+L2,S1,T2
+
+# stop_times.txt
+trip_id,arrival_time,departure_time,stop_id,stop_sequence
+T1,10:00:00,10:00:00,A,1
+T1,10:10:00,10:10:00,B,2
+T2,10:20:00,10:20:00,B,1
+T2,10:30:00,10:30:00,C,2
+
+# fare_products.txt
+fare_product_id,fare_product_name,fare_media_id,amount,currency
+SINGLE,Single,,2.50,EUR
+
+# networks.txt
+network_id,network_name
+N1,Network 1
+N2,Network 2
+
+# route_networks.txt
+network_id,route_id
+N1,L1
+N2,L2
+
+# fare_leg_rules.txt
+leg_group_id,network_id,fare_product_id
+core,N1,SINGLE
+"""
+
+# 2024-01-01T00:00:00Z in minutes since epoch
+DAY_START = 28401120
+
 
 def test_offset():
     """Test Offset creation."""
@@ -85,6 +141,130 @@ def test_query_with_offsets():
     assert len(query.destination) == 1
 
 
+def test_query_with_offset_arrays():
+    """Test Query offsets from NumPy arrays."""
+    np = pytest.importorskip("numpy")
+    query = ng.Query()
+
+    query.set_start_offsets(np.array([1, 2, 3]), np.array([0, 5, 10]))
+    query.set_destination_offsets([4], [7], transport_modes=[2])
+
+    assert len(query.start) == 3
+    assert query.start[2].target() == ng.LocationIdx(3)
+    assert query.start[2].duration() == 10
+    assert query.destination[0].type() == 2
+
+    with pytest.raises(ValueError):
+        query.set_start_offsets(np.array([1, 2]), np.array([0]))
+    with pytest.raises(ValueError):
+        query.set_start_offsets(np.array([1]), np.array([40000]))
+    with pytest.raises(ValueError):
+        query.set_destination_offsets(np.array([1]), np.array([-1]))
+
+    query.set_td_start_offsets(
+        locations=np.array([1, 2]),
+        indptr=np.array([0, 1, 3]),
+        valid_from=np.array([0, 0, 60]),
+        durations=np.array([5, 5, 10]),
+    )
+    with pytest.raises(ValueError):
+        query.set_td_start_offsets([1], [0, 2], [0], [5])
+    with pytest.raises(ValueError):
+        query.set_td_start_offsets(
+            locations=np.array([1, 2]),
+            indptr=np.array([0, 5, 3]),
+            valid_from=np.array([0, 0, 60]),
+            durations=np.array([5, 5, 10]),
+            transport_modes=np.array([0, 0, 0]),
+        )
+
+
+def test_fares_empty():
+    """Test batched fare computation on an empty timetable."""
+    np = pytest.importorskip("numpy")
+    timetable = ng.Timetable()
+    dtypes = {
+        "journey": np.int32,
+        "transfer": np.int32,
+        "from_leg": np.int32,
+        "to_leg": np.int32,
+        "source": np.int32,
+        "product": np.int64,
+        "transfer_product": np.int64,
+        "amount": np.float32,
+        "transfer_amount": np.float32,
+    }
+
+    fares = ng.get_fares(timetable, [])
+    assert set(fares) == set(dtypes)
+    for key, dtype in dtypes.items():
+        assert fares[key].dtype == dtype
+        assert len(fares[key]) == 0
+
+    parallel = ng.get_fares(timetable, [], parallel=True)
+    assert set(parallel) == set(dtypes)
+    for key in dtypes:
+        assert np.array_equal(parallel[key], fares[key])
+        assert parallel[key].dtype == fares[key].dtype
+
+    with pytest.raises(IndexError):
+        ng.get_fare_product(timetable, ng.SourceIdx(0), 0)
+
+
+def test_fares():
+    """Test batched fare computation on routed journeys."""
+    np = pytest.importorskip("numpy")
+    timetable = ng.load_timetable(
+        [ng.TimetableSource("fares", FARES_FEED)], "2024-01-01", "2024-01-02"
+    )
+    a = timetable.find_location("A")
+    b = timetable.find_location("B")
+    c = timetable.find_location("C")
+
+    def route(start_offset):
+        query = ng.Query()
+        query.start_time = (DAY_START, DAY_START + 1440)
+        query.start = [ng.Offset(a, start_offset, 0)]
+        query.destination = [ng.Offset(c, 0, 0)]
+        journeys = ng.route(timetable, query)
+        assert len(journeys) == 1
+        return journeys[0]
+
+    # Same transit legs: the first two are equal, the third one differs in
+    # its start offset (and therefore in its non-transit legs).
+    journeys = [route(0), route(0), route(5)]
+    for parallel in (False, True):
+        fares = ng.get_fares(timetable, journeys, parallel=parallel)
+        assert list(fares["journey"]) == [0, 0, 1, 1, 2, 2]
+        for row in range(len(fares["journey"])):
+            legs = journeys[fares["journey"][row]].legs
+            from_leg = legs[fares["from_leg"][row]]
+            to_leg = legs[fares["to_leg"][row]]
+            assert fares["from_leg"][row] == fares["to_leg"][row]
+            assert fares["source"][row] == 0
+            assert fares["transfer_product"][row] == -1
+            assert np.isnan(fares["transfer_amount"][row])
+            if getattr(from_leg, "from") == a:
+                # L1: matched by the N1 rule
+                assert to_leg.to == b
+                assert fares["product"][row] == 0
+                assert fares["amount"][row] == pytest.approx(2.5)
+            else:
+                # L2: fare leg without matching rule
+                assert (getattr(from_leg, "from"), to_leg.to) == (b, c)
+                assert fares["product"][row] == -1
+                assert np.isnan(fares["amount"][row])
+        assert sorted(fares["product"][:2]) == [-1, 0]
+        assert list(fares["product"][:2]) == list(fares["product"][2:4])
+
+    product = ng.get_fare_product(timetable, ng.SourceIdx(0), 0)
+    assert product == [
+        {"id": "SINGLE", "name": "Single", "amount": 2.5, "currency": "EUR"}
+    ]
+    with pytest.raises(IndexError):
+        ng.get_fare_product(timetable, ng.SourceIdx(0), 1)
+
+
 def test_query_with_via_stops():
     """Test Query with via stops."""
     query = ng.Query()
@@ -25,6 +25,42 @@ def test_rt_timetable_creation():
     assert rt_tt is not None
 
 
+def test_vdv_aus_statistics_creation():
+    """Test VdvAusStatistics creation."""
+    stats = ng.VdvAusStatistics()
+    assert stats.total_runs == 0
+    assert not stats.error
+
+
+def test_vdv_aus_formats():
+    """Test VdvAusUpdater format enum."""
+    assert ng.VdvAusUpdater.Format.VDV != ng.VdvAusUpdater.Format.SIRI
+    assert ng.VdvAusUpdater.SIRI_JSON == ng.VdvAusUpdater.Format.SIRI_JSON
+
+
+def test_vdv_aus_parse_errors():
+    """Test that invalid XML and JSON payloads are reported the same way."""
+    timetable = ng.Timetable()
+    for fmt in (ng.VdvAusUpdater.Format.SIRI, ng.VdvAusUpdater.Format.SIRI_JSON):
+        updater = ng.VdvAusUpdater(timetable, ng.SourceIdx(0), fmt)
+        stats = updater.update(ng.RtTimetable(), b"<not {valid")
+        assert stats.error
+
+
+def test_rt_update_rejects_non_contiguous_buffers():
+    """Test that strided memoryviews are rejected instead of misread."""
+    timetable = ng.Timetable()
+    data = memoryview(b"\x08\x01\x10\x02")
+    for view in (data[::-1], data[::2]):
+        with pytest.raises(BufferError):
+            ng.gtfsrt_update_from_bytes(
+                timetable, ng.RtTimetable(), ng.SourceIdx(0), "test", view
+            )
+        updater = ng.VdvAusUpdater(timetable, ng.SourceIdx(0))
+        with pytest.raises(BufferError):
+            updater.update(ng.RtTimetable(), view)
+
+
 # Note: Full RT tests would require a loaded timetable and RT data
 # The following tests are commented out as they require real data
 
@@ -0,0 +1,113 @@
+"""
+Unit tests for pynigiri tracing.
+"""
+import json
+
+import pytest
+import pynigiri as ng
+
+
+def test_enable_tracing_requires_output():
+    """Test that tracing needs a file or a callback."""
+    with pytest.raises(ValueError):
+        ng.enable_tracing()
+
+
+def test_gtfsrt_update_span(tmp_path):
+    """Test the span of a failed GTFS-RT update."""
+    payload = b"\xff\xff\xff\xff"
+    spans = []
+    path = tmp_path / "spans.jsonl"
+    ng.enable_tracing(file=str(path), callback=spans.append)
+    try:
+        stats = ng.gtfsrt_update_from_bytes(
+            ng.Timetable(), ng.RtTimetable(), ng.SourceIdx(0), "test", payload
+        )
+    finally:
+        ng.disable_tracing()
+
+    assert stats.parser_error
+    assert len(spans) == 1
+    span = spans[0]
+    assert span["name"] == "gtfsrt_update_buf"
+    assert span["parent_span_id"] is None
+    assert len(span["trace_id"]) == 32
+    assert len(span["span_id"]) == 16
+    assert span["status"] == "error"
+    assert span["attributes"]["tag"] == "test"
+    assert span["attributes"]["nigiri.gtfsrt.size"] == len(payload)
+    assert span["start_time_unix_nano"] <= span["end_time_unix_nano"]
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 1
+    request = json.loads(lines[0])
+    exported = request["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert exported["name"] == "gtfsrt_update_buf"
+    assert exported["traceId"] == span["trace_id"]
+    assert exported["spanId"] == span["span_id"]
+    assert "parentSpanId" not in exported
+    assert exported["status"]["code"] == 2
+
+
+def test_load_spans():
+    """Test loader spans and their parent links for an in-memory feed."""
+    feed = """
+# agency.txt
+agency_id,agency_name,agency_url,agency_timezone
+AG,Agency,https://example.com,Europe/Berlin
+
+# stops.txt
+stop_id,stop_name,stop_lat,stop_lon
+A,A,1.0,1.0
+B,B,1.0,2.0
+
+# calendar_dates.txt
+service_id,date,exception_type
+S1,20240101,1
+
+# routes.txt
+route_id,agency_id,route_short_name,route_long_name,route_type
+R1,AG,R1,,3
+
+# trips.txt
+route_id,service_id,trip_id
+R1,S1,T1
+
+# stop_times.txt
+trip_id,arrival_time,departure_time,stop_id,stop_sequence
+T1,10:00:00,10:00:00,A,1
+T1,10:10:00,10:10:00,B,2
+"""
+    spans = []
+    ng.enable_tracing(callback=spans.append)
+    try:
+        ng.load_timetable(
+            [ng.TimetableSource("mem", feed)], "2024-01-01", "2024-01-02"
+        )
+    finally:
+        ng.disable_tracing()
+
+    by_name = {span["name"]: span for span in spans}
+    load = by_name["loader::load"]
+    source = by_name["loader::load_source"]
+    assert load["parent_span_id"] is None
+    assert source["parent_span_id"] == load["span_id"]
+    assert source["trace_id"] == load["trace_id"]
+    assert source["attributes"]["tag"] == "mem"
+    # The path of an in-memory source is the feed itself: not recorded.
+    assert "path" not in source["attributes"]
+
+
+def test_disable_tracing_stops_recording():
+    """Test that no spans are recorded after disable_tracing."""
+    spans = []
+    ng.enable_tracing(callback=spans.append)
+    ng.disable_tracing()
+    ng.gtfsrt_update_from_bytes(
+        ng.Timetable(), ng.RtTimetable(), ng.SourceIdx(0), "test", b"\xff"
+    )
+    assert spans == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -10,6 +10,7 @@
 #include "nigiri/loader/build_lb_graph.h"
 #include "nigiri/loader/register.h"
 #include "nigiri/flex.h"
+#include "nigiri/get_otel_tracer.h"
 #include "nigiri/special_stations.h"
 #include "nigiri/timetable.h"
 
@@ -150,6 +151,9 @@ void correct_color_contrast(timetable& tt) {
 }
 
 void finalize(timetable& tt, finalize_options const opt) {
+  auto span = get_otel_tracer()->StartSpan("loader::finalize");
+  auto scope = opentelemetry::trace::Scope{span};
+
   tt.location_routes_.resize(tt.n_locations());
 
   {
@@ -179,9 +183,17 @@ void finalize(timetable& tt, finalize_options const opt) {
                  std::tie(tt.providers_[b].src_, tt.providers_[b].id_);
         });
   }
-  build_footpaths(tt, opt);
-  build_lb_graph<direction::kForward>(tt, kDefaultProfile);
-  build_lb_graph<direction::kBackward>(tt, kDefaultProfile);
+  {
+    auto fp_span = get_otel_tracer()->StartSpan("loader::build_footpaths");
+    auto fp_scope = opentelemetry::trace::Scope{fp_span};
+    build_footpaths(tt, opt);
+  }
+  {
+    auto lb_span = get_otel_tracer()->StartSpan("loader::build_lb_graph");
+    auto lb_scope = opentelemetry::trace::Scope{lb_span};
+    build_lb_graph<direction::kForward>(tt, kDefaultProfile);
+    build_lb_graph<direction::kBackward>(tt, kDefaultProfile);
+  }
   build_location_tree(tt);
   assign_stops_to_flex_areas(tt);
   assign_importance(tt);
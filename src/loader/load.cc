@@ -5,6 +5,7 @@
 #include "utl/enumerate.h"
 #include "utl/progress_tracker.h"
 
+#include "nigiri/get_otel_tracer.h"
 #include "nigiri/loader/dir.h"
 #include "nigiri/loader/gtfs/loader.h"
 #include "nigiri/loader/hrd/loader.h"
@@ -31,6 +32,9 @@ timetable load(std::vector<timetable_source> const& sources,
                assistance_times* a,
                shapes_storage* shapes,
                bool ignore) {
+  auto span = get_otel_tracer()->StartSpan("loader::load");
+  auto scope = opentelemetry::trace::Scope{span};
+
   auto const loaders = get_loaders();
 
   auto tt = timetable{};
@@ -54,9 +58,17 @@ timetable load(std::vector<timetable_source> const& sources,
         log(log_lvl::info, "loader.load", "loading {}", path);
       }
       progress_tracker->context(std::string{tag});
+      auto src_span = get_otel_tracer()->StartSpan(
+          "loader::load_source", {{"tag", std::string_view{tag}}});
+      if (!is_in_memory) {
+        src_span->SetAttribute("path", std::string_view{path});
+      }
+      auto src_scope = opentelemetry::trace::Scope{src_span};
       try {
         (*it)->load(local_config, src, *dir, tt, bitfields, a, shapes);
       } catch (std::exception const& e) {
+        src_span->SetStatus(opentelemetry::trace::StatusCode::kError,
+                            e.what());
         throw utl::fail("failed to load {}: {}", path, e.what());
       }
       progress_tracker->context("");
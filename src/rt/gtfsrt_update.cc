@@ -816,12 +816,19 @@ statistics gtfsrt_update_buf(timetable const& tt,
                              std::string_view protobuf,
                              gtfsrt::FeedMessage& msg,
                              bool const use_vehicle_position) {
+  auto span = get_otel_tracer()->StartSpan("gtfsrt_update_buf", {{"tag", tag}});
+  auto scope = opentelemetry::trace::Scope{span};
+  span->SetAttribute("nigiri.gtfsrt.size",
+                     static_cast<std::uint64_t>(protobuf.size()));
+
   msg.Clear();
 
   auto const success =
       msg.ParseFromArray(reinterpret_cast<void const*>(protobuf.data()),
                          static_cast<int>(protobuf.size()));
   if (!success) {
+    span->SetStatus(opentelemetry::trace::StatusCode::kError,
+                    "protobuf parse error");
     log(log_lvl::debug, "rt.gtfs",
         "GTFS-RT error (tag={}): unable to parse protobuf message: {}", tag,
         protobuf.substr(0, std::min(protobuf.size(), size_t{1000U})));
@@ -3,6 +3,7 @@
 #include <ranges>
 
 #include "cista/io.h"
+#include "cista/serialization.h"
 
 #include "utl/overloaded.h"
 #include "utl/verify.h"
@@ -284,10 +285,50 @@ day_list timetable::days(bitfield const& bf) const {
   return day_list{bf, internal_interval_days().from_};
 }
 
+constexpr auto const kMode =
+    cista::mode::WITH_INTEGRITY | cista::mode::WITH_STATIC_VERSION;
+
 cista::wrapped<timetable> timetable::read(std::filesystem::path const& p) {
   return cista::read<timetable>(p);
 }
 
+cista::wrapped<timetable> timetable::read(cista::memory_holder&& mem) {
+  return std::visit(
+      utl::overloaded{[&](cista::buf<cista::mmap>& b) {
+                        auto const ptr = cista::deserialize<timetable, kMode>(
+                            &b[0], &b[0] + b.size());
+                        return cista::wrapped{std::move(mem), ptr};
+                      },
+                      [&](cista::buffer& b) {
+                        auto const ptr =
+                            cista::deserialize<timetable, kMode>(b);
+                        return cista::wrapped{std::move(mem), ptr};
+                      },
+                      [&](cista::byte_buf& b) {
+                        auto const ptr =
+                            cista::deserialize<timetable, kMode>(b);
+                        return cista::wrapped{std::move(mem), ptr};
+                      }},
+      mem);
+}
+
+void timetable::write(cista::memory_holder& mem) const {
+  std::visit(utl::overloaded{[&](cista::buf<cista::mmap>& writer) {
+                               cista::serialize<kMode>(writer, *this);
+                             },
+                             [&](cista::buffer&) {
+                               throw utl::fail(
+                                   "timetable::write: cista::buffer is "
+                                   "read-only");
+                             },
+                             [&](cista::byte_buf& b) {
+                               auto writer = cista::buf{std::move(b)};
+                               cista::serialize<kMode>(writer, *this);
+                               b = std::move(writer.buf_);
+                             }},
+             mem);
+}
+
 void timetable::write(std::filesystem::path const& p) const {
   return cista::write(p, *this);
 }